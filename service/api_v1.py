@@ -1,49 +1,22 @@
 # service/api_v1.py
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException
-from .models import PreprocessRequest, JobStatusResponse, PreprocessResultResponse
-from .jobs import create_job, get_job, JobStatus
+from .models import (
+    PreprocessRequest,
+    JobStatusResponse,
+    PreprocessResultResponse,
+    PeakQueryResponse,
+    CurveEnvelopeResponse,
+)
+from .peak_index import PeakIndex
+from .jobs import get_job, run_job, JobStatus
 from .logging_utils import log_event
-
-from timeseries_preproc.pipeline import preprocess_csv
+from .scheduler import cost_model, scheduler
 
 router = APIRouter(prefix="/v1")
 
-@router.post("/jobs", response_model=JobStatusResponse)
-def create_preprocess_job(req: PreprocessRequest):
-    job = create_job()
-    log_event("job_created", job_id=job.job_id)
-
-    # Mark running
-    job.status = JobStatus.RUNNING
-    job.started_at = __import__("time").time()
-    log_event("job_started", job_id=job.job_id, csv_path=req.csv_path)
-
-    try:
-        pre_df, ann_df = preprocess_csv(
-            path=req.csv_path,
-            smoothing_window=req.smoothing_window,
-            arc_normalization=req.arc_normalization,
-            min_peak_distance=req.min_peak_distance,
-            min_rel_height=req.min_rel_height,
-            time_index_column=req.time_index_column,
-        )
-        job.preprocessed_df = pre_df
-        job.annotations_df = ann_df
-        job.status = JobStatus.SUCCESS
-        job.finished_at = __import__("time").time()
-        log_event(
-            "job_completed",
-            job_id=job.job_id,
-            duration=job.duration_seconds,
-            n_curves=pre_df.shape[1],
-        )
-    except Exception as e:
-        job.status = JobStatus.FAILED
-        job.finished_at = __import__("time").time()
-        job.error_message = str(e)
-        log_event("job_failed", job_id=job.job_id, error=str(e))
-        raise HTTPException(status_code=500, detail="Job failed")
-
+def _status_response(job) -> JobStatusResponse:
     return JobStatusResponse(
         job_id=job.job_id,
         status=job.status,
@@ -51,21 +24,36 @@ def create_preprocess_job(req: PreprocessRequest):
         finished_at=str(job.finished_at),
         duration_seconds=job.duration_seconds,
         error_message=job.error_message,
+        approximate=job.approximate,
+        lane=job.lane,
+        estimated_seconds=job.estimated_seconds,
     )
 
+@router.post("/jobs", response_model=JobStatusResponse)
+def create_preprocess_job(req: PreprocessRequest):
+    return _status_response(run_job(req))
+
+@router.post("/jobs/{job_id}/refine", response_model=JobStatusResponse)
+def refine_preview_job(job_id: str):
+    """Re-run a preview job's request at full resolution as a new job."""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.request is None:
+        raise HTTPException(status_code=400, detail="Job has no stored request")
+    log_event("job_refine_requested", job_id=job_id)
+    return _status_response(run_job(job.request.model_copy(update={"preview_factor": 1})))
+
+@router.get("/scheduler")
+def get_scheduler_stats():
+    return {**scheduler.stats(), "cost_model": cost_model.stats()}
+
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
 def get_job_status(job_id: str):
     job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return JobStatusResponse(
-        job_id=job.job_id,
-        status=job.status,
-        started_at=str(job.started_at),
-        finished_at=str(job.finished_at),
-        duration_seconds=job.duration_seconds,
-        error_message=job.error_message,
-    )
+    return _status_response(job)
 
 @router.get("/jobs/{job_id}/results", response_model=PreprocessResultResponse)
 def get_job_results(job_id: str):
@@ -75,11 +63,98 @@ def get_job_results(job_id: str):
     if job.status != JobStatus.SUCCESS:
         raise HTTPException(status_code=400, detail=f"Job not successful: {job.status}")
     # For responses, send only head() to keep JSON small
-    pre_head = job.preprocessed_df.to_dict(orient="records")
-    ann_head = job.annotations_df.to_dict(orient="records")
+    pre_head = job.result.to_preprocessed_df().to_dict(orient="records")
+    ann_head = job.result.to_annotations_df().to_dict(orient="records")
     return PreprocessResultResponse(
         job_id=job.job_id,
         status=job.status,
         preprocessed_head=pre_head,
         annotations_head=ann_head,
+        approximate=job.approximate,
+        row_step=job.result.row_step,
+        row_offset=job.result.row_offset,
+    )
+
+def _get_peak_index(job_id: str) -> PeakIndex:
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.SUCCESS or job.peaks is None:
+        raise HTTPException(status_code=400, detail=f"Job not successful: {job.status}")
+    return job.peaks
+
+@router.get("/jobs/{job_id}/peaks", response_model=PeakQueryResponse)
+def query_peaks(
+    job_id: str,
+    start: Optional[int] = None,
+    stop: Optional[int] = None,
+    curve_id: Optional[str] = None,
+    salient_only: bool = False,
+):
+    """Peaks with start <= peak_index < stop, optionally for a single curve."""
+    index = _get_peak_index(job_id)
+    try:
+        peaks = index.window(start, stop, curve_id=curve_id, salient_only=salient_only)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Curve not found: {curve_id}")
+    return PeakQueryResponse(job_id=job_id, n_peaks=len(peaks), peaks=peaks)
+
+@router.get("/jobs/{job_id}/peaks/top", response_model=PeakQueryResponse)
+def query_top_peaks(
+    job_id: str,
+    k: int = 100,
+    curve_id: Optional[str] = None,
+    salient_only: bool = False,
+):
+    """The k highest peaks, globally or for a single curve."""
+    if k < 0:
+        raise HTTPException(status_code=400, detail="k must be non-negative")
+    index = _get_peak_index(job_id)
+    try:
+        peaks = index.top_k(k, curve_id=curve_id, salient_only=salient_only)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Curve not found: {curve_id}")
+    return PeakQueryResponse(job_id=job_id, n_peaks=len(peaks), peaks=peaks)
+
+@router.get("/jobs/{job_id}/curves/{curve_id}", response_model=CurveEnvelopeResponse)
+def get_curve_envelope(
+    job_id: str,
+    curve_id: str,
+    start: int = 0,
+    stop: Optional[int] = None,
+    max_points: int = 1000,
+):
+    """
+    Min/max envelope of one curve over original rows [start, stop) within
+    max_points. Preview jobs only hold decimated rows, so their envelope
+    covers the stored rows falling in that range.
+    """
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.SUCCESS:
+        raise HTTPException(status_code=400, detail=f"Job not successful: {job.status}")
+    if job.pyramid is None:
+        raise HTTPException(status_code=400, detail="Job was run without build_pyramid")
+    if max_points < 2:
+        raise HTTPException(status_code=400, detail="max_points must be >= 2")
+    try:
+        column = job.peaks.curve_position(curve_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Curve not found: {curve_id}")
+
+    # The pyramid is built over the stored rows, which are decimated for
+    # preview jobs; requests and responses use original row positions.
+    result = job.result
+    rows_stop = None if stop is None else result.to_rows(stop)
+    bucket_size, x, y_min, y_max = job.pyramid.query(
+        column, result.to_rows(start), rows_stop, max_points
+    )
+    return CurveEnvelopeResponse(
+        job_id=job_id,
+        curve_id=curve_id,
+        bucket_size=bucket_size * result.row_step,
+        x=(x * result.row_step + result.row_offset).tolist(),
+        y_min=y_min.tolist(),
+        y_max=y_max.tolist(),
     )
@@ -1,8 +1,19 @@
 # service/jobs.py
+import time
 import uuid
 from enum import Enum
 from typing import Optional, Dict
 
+from fastapi import HTTPException
+
+from .models import PreprocessRequest
+from .results import JobResult
+from .peak_index import PeakIndex
+from .logging_utils import log_event
+from .scheduler import SchedulerFull, cost_model, scheduler, route
+from timeseries_preproc.downsampling import MinMaxPyramid
+from timeseries_preproc.pipeline import preprocess_csv
+
 class JobStatus(str, Enum):
     PENDING = "PENDING"
     RUNNING = "RUNNING"
@@ -10,14 +21,45 @@ class JobStatus(str, Enum):
     FAILED = "FAILED"
 
 class JobRecord:
+    __slots__ = (
+        "job_id",
+        "status",
+        "started_at",
+        "finished_at",
+        "error_message",
+        "request",
+        "lane",
+        "estimated_seconds",
+        "result",
+        "peaks",
+        "pyramid",
+    )
+
     def __init__(self, job_id: str):
         self.job_id = job_id
         self.status = JobStatus.PENDING
         self.started_at: Optional[float] = None
         self.finished_at: Optional[float] = None
         self.error_message: Optional[str] = None
-        self.preprocessed_df = None
-        self.annotations_df = None
+        self.request: Optional[PreprocessRequest] = None
+        self.lane: Optional[str] = None
+        self.estimated_seconds: Optional[float] = None
+        self.result: Optional[JobResult] = None
+        self.peaks: Optional[PeakIndex] = None
+        self.pyramid: Optional[MinMaxPyramid] = None
+
+    # DataFrame views are built from the compact result on demand
+    @property
+    def preprocessed_df(self):
+        return self.result.to_preprocessed_df() if self.result is not None else None
+
+    @property
+    def annotations_df(self):
+        return self.result.to_annotations_df() if self.result is not None else None
+
+    @property
+    def approximate(self) -> bool:
+        return self.request is not None and self.request.preview_factor > 1
 
     @property
     def duration_seconds(self) -> Optional[float]:
@@ -35,3 +77,78 @@ def create_job() -> JobRecord:
 
 def get_job(job_id: str) -> Optional[JobRecord]:
     return jobs.get(job_id)
+
+def run_job(req: PreprocessRequest, event_suffix: str = "") -> JobRecord:
+    """
+    Create a job for `req` and run it to completion under the scheduler.
+
+    Raises HTTPException 429 if the scheduler's waiting queue is full and
+    500 if preprocessing fails. `event_suffix` is appended to the names of
+    logged events (e.g. "_v2").
+    """
+    job = create_job()
+    job.request = req
+    log_event("job_created" + event_suffix, job_id=job.job_id)
+
+    estimate, lane = route(req)
+    job.lane = lane
+    job.estimated_seconds = estimate.seconds
+    log_event(
+        "job_queued" + event_suffix,
+        job_id=job.job_id,
+        lane=lane,
+        client_id=req.client_id,
+        estimated_seconds=estimate.seconds,
+        n_rows=estimate.n_rows,
+        n_curves=estimate.n_curves,
+    )
+
+    try:
+        ticket = scheduler.acquire(req.client_id, lane, estimate.seconds)
+    except SchedulerFull as e:
+        job.status = JobStatus.FAILED
+        job.error_message = str(e)
+        log_event("job_rejected" + event_suffix, job_id=job.job_id, client_id=req.client_id, lane=lane)
+        raise HTTPException(status_code=429, detail=str(e))
+
+    try:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        log_event("job_started" + event_suffix, job_id=job.job_id, csv_path=req.csv_path)
+
+        pre_df, ann_df = preprocess_csv(
+            path=req.csv_path,
+            smoothing_window=req.smoothing_window,
+            arc_normalization=req.arc_normalization,
+            min_peak_distance=req.min_peak_distance,
+            min_rel_height=req.min_rel_height,
+            time_index_column=req.time_index_column,
+            preview_factor=req.preview_factor,
+            preview_method=req.preview_method,
+        )
+        job.result = JobResult.from_dataframes(pre_df, ann_df, float32=req.store_float32)
+        job.peaks = PeakIndex.from_result(job.result)
+        if req.build_pyramid:
+            job.pyramid = MinMaxPyramid(job.result.values)
+        job.status = JobStatus.SUCCESS
+        job.finished_at = time.time()
+        log_event(
+            "job_completed" + event_suffix,
+            job_id=job.job_id,
+            duration=job.duration_seconds,
+            estimated_seconds=estimate.seconds,
+            n_curves=pre_df.shape[1],
+            preview_factor=req.preview_factor,
+        )
+    except Exception as e:
+        job.status = JobStatus.FAILED
+        job.finished_at = time.time()
+        job.error_message = str(e)
+        log_event("job_failed" + event_suffix, job_id=job.job_id, error=str(e))
+        raise HTTPException(status_code=500, detail="Job failed")
+    finally:
+        scheduler.release(ticket)
+
+    # Feed (estimated, actual) back into the cost model for calibration
+    cost_model.record(estimate, job.duration_seconds)
+    return job
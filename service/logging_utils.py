@@ -1,7 +1,12 @@
 # service/logging_utils.py
-import logging
+import atexit
 import json
-from datetime import datetime
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
 
 logger = logging.getLogger("timeseries_service")
 logger.setLevel(logging.INFO)
@@ -11,11 +16,228 @@ formatter = logging.Formatter('%(message)s')  # raw JSON in message
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+
+class _FlushMarker:
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AsyncEventLogger:
+    """
+    Queue-backed structured event logger.
+
+    ``log`` only appends a (timestamp, event, job_id, fields) tuple to a
+    bounded queue; a background thread serializes records to JSON and writes
+    them through ``target`` in batches (one log call per batch).
+
+    When the queue is more than ``busy_fraction`` full, events are sampled:
+    only one in ``busy_sample_every`` is kept, except events listed in
+    ``always_keep``. When the queue is full, events are dropped; so are
+    events logged after ``shutdown`` and batches the sink fails to write.
+    All losses are counted, and the writer reports new producer-side losses
+    as a ``log_events_dropped`` record.
+    """
+
+    def __init__(
+        self,
+        target: logging.Logger,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        busy_fraction: float = 0.8,
+        busy_sample_every: int = 10,
+        always_keep: tuple = ("job_failed", "job_failed_v2"),
+    ):
+        self.target = target
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.busy_size = int(max_queue * busy_fraction)
+        self.busy_sample_every = max(1, busy_sample_every)
+        self.always_keep = frozenset(always_keep)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+        # Counters and the closed flag are guarded by _stats_lock, which is
+        # also held around the enqueue so nothing is queued after shutdown
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self._busy_seen = 0
+        self.enqueued = 0
+        self.written = 0
+        self.dropped_full = 0
+        self.dropped_sampled = 0
+        self.dropped_closed = 0
+        self.dropped_sink = 0
+        self._reported_drops = 0
+
+    # ---- producer side -------------------------------------------------
+
+    def log(self, event: str, job_id: str, **kwargs) -> bool:
+        """Enqueue an event. Returns False if it was dropped or sampled out."""
+        if self._thread is None:
+            self.start()
+
+        record = (time.time(), event, job_id, kwargs)
+        with self._stats_lock:
+            if self._closed:
+                self.dropped_closed += 1
+                return False
+
+            if self._queue.qsize() >= self.busy_size and event not in self.always_keep:
+                self._busy_seen += 1
+                if self._busy_seen % self.busy_sample_every:
+                    self.dropped_sampled += 1
+                    return False
+
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self.dropped_full += 1
+                return False
+            self.enqueued += 1
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped_full": self.dropped_full,
+                "dropped_sampled": self.dropped_sampled,
+                "dropped_closed": self.dropped_closed,
+                "dropped_sink": self.dropped_sink,
+                "queued": self._queue.qsize(),
+            }
+
+    # ---- lifecycle -----------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._closed or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="event-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything enqueued so far is written."""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        marker = _FlushMarker()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """
+        Stop accepting events, write everything already queued and stop the
+        writer thread. Events logged afterwards are counted as dropped_closed.
+        """
+        with self._stats_lock:
+            self._closed = True
+        self._stopping.set()
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            # Only a wake-up; the writer drains until the queue is empty
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+
+    # ---- writer side ---------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._report_drops()
+                if self._stopping.is_set():
+                    return
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            markers = []
+            for item in batch:
+                if isinstance(item, _FlushMarker):
+                    markers.append(item)
+                elif item is not _STOP:
+                    lines.append(self._serialize(*item))
+
+            self._write(lines)
+            self._report_drops()
+            for marker in markers:
+                marker.done.set()
+            # No producer can enqueue once closed, so an empty queue is final
+            if self._stopping.is_set() and self._queue.empty():
+                return
+
+    def _report_drops(self) -> None:
+        with self._stats_lock:
+            dropped_full = self.dropped_full
+            dropped_sampled = self.dropped_sampled
+        dropped = dropped_full + dropped_sampled
+        if dropped != self._reported_drops:
+            self._reported_drops = dropped
+            self._write(
+                [
+                    self._serialize(
+                        time.time(),
+                        "log_events_dropped",
+                        None,
+                        {"dropped_full": dropped_full, "dropped_sampled": dropped_sampled},
+                    )
+                ]
+            )
+
+    def _write(self, lines) -> None:
+        if not lines:
+            return
+        try:
+            self.target.info("\n".join(lines))
+        except Exception:
+            # Never let a broken sink kill the writer thread, but count the loss
+            with self._stats_lock:
+                self.dropped_sink += len(lines)
+            return
+        with self._stats_lock:
+            self.written += len(lines)
+
+    @staticmethod
+    def _serialize(ts: float, event: str, job_id: Optional[str], fields: dict) -> str:
+        stamp = datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)
+        payload = {
+            "timestamp": stamp.isoformat() + "Z",
+            "event": event,
+            "job_id": job_id,
+            **fields,
+        }
+        return json.dumps(payload, default=str)
+
+
+event_logger = AsyncEventLogger(logger)
+atexit.register(event_logger.shutdown)
+
+
 def log_event(event: str, job_id: str, **kwargs):
-    payload = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "event": event,
-        "job_id": job_id,
-        **kwargs,
-    }
-    logger.info(json.dumps(payload))
+    event_logger.log(event, job_id, **kwargs)
@@ -1,6 +1,6 @@
 # service/models.py
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Literal
 
 class PreprocessRequest(BaseModel):
     csv_path: str                 # or later: can be replaced by file upload
@@ -10,6 +10,12 @@ class PreprocessRequest(BaseModel):
     min_peak_distance: int = 5
     min_rel_height: float = 0.1
     time_index_column: Optional[str] = None
+    store_float32: bool = False   # downcast retained results to float32
+    build_pyramid: bool = False   # build min/max pyramid for /curves queries
+    preview_factor: int = Field(1, ge=1)  # > 1: fast approximate run on decimated data
+    preview_method: Literal["mean", "stride"] = "mean"
+    client_id: Optional[str] = None  # per-client fair-share limits apply only when set
+    lane: Optional[Literal["interactive", "batch"]] = None  # None picks by estimated cost
 
 class JobStatusResponse(BaseModel):
     job_id: str
@@ -18,9 +24,30 @@ class JobStatusResponse(BaseModel):
     finished_at: Optional[str] = None
     duration_seconds: Optional[float] = None
     error_message: Optional[str] = None
+    approximate: bool = False     # True for preview jobs
+    lane: Optional[str] = None
+    estimated_seconds: Optional[float] = None
 
 class PreprocessResultResponse(BaseModel):
     job_id: str
     status: str
     preprocessed_head: List[Dict[str, Any]]
     annotations_head: List[Dict[str, Any]]
+    approximate: bool = False
+    # preprocessed row r is original row r * row_step + row_offset;
+    # peak_index is always an original row position
+    row_step: int = 1
+    row_offset: int = 0
+
+class PeakQueryResponse(BaseModel):
+    job_id: str
+    n_peaks: int
+    peaks: List[Dict[str, Any]]
+
+class CurveEnvelopeResponse(BaseModel):
+    job_id: str
+    curve_id: str
+    bucket_size: int              # original rows per point; preview_factor for raw preview rows
+    x: List[int]                  # original row position of each bucket's first sample
+    y_min: List[float]
+    y_max: List[float]
@@ -0,0 +1,210 @@
+# service/peak_index.py
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .results import JobResult
+
+
+def _perm_dtype(n: int):
+    return np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+
+class _PeakView:
+    """
+    Orderings over a subset of the peaks (all of them, or salient only).
+
+    Every array here holds positions into the result's peak arrays, which
+    are sorted by (curve, peak_index). ``members`` is None for the full set,
+    in which case a curve's peaks are simply a contiguous range.
+    """
+
+    __slots__ = ("members", "curve_offsets", "by_time", "by_value", "by_curve_value")
+
+    def __init__(
+        self,
+        members: Optional[np.ndarray],
+        curve_offsets: np.ndarray,
+        by_time: np.ndarray,
+        by_value: np.ndarray,
+        by_curve_value: np.ndarray,
+    ):
+        self.members = members
+        self.curve_offsets = curve_offsets
+        self.by_time = by_time
+        self.by_value = by_value
+        self.by_curve_value = by_curve_value
+
+    @property
+    def size(self) -> int:
+        return self.by_time.size
+
+    def curve_members(self, pos: int) -> np.ndarray:
+        lo, hi = int(self.curve_offsets[pos]), int(self.curve_offsets[pos + 1])
+        if self.members is None:
+            return np.arange(lo, hi)
+        return self.members[lo:hi]
+
+    def curve_by_value(self, pos: int) -> np.ndarray:
+        lo, hi = int(self.curve_offsets[pos]), int(self.curve_offsets[pos + 1])
+        return self.by_curve_value[lo:hi]
+
+
+class PeakIndex:
+    """
+    Read-only index over a job's peak annotations.
+
+    Built once when a job completes. The peak arrays themselves are the
+    ``JobResult`` arrays (already sorted by curve, then peak_index), shared
+    rather than copied; the index only adds permutations:
+      - per-curve offsets, for per-curve and per-curve time-window lookups
+      - peaks by peak_index across all curves, for global time-window lookups
+      - peaks by descending peak_value (globally and per curve), for top-K
+    The salient-only view is the same permutations filtered to salient peaks.
+
+    Time windows are expressed in peak_index positions, half-open [start, stop).
+    Window lookups cost O(log n + k); per-curve and top-K lookups cost O(k).
+    """
+
+    __slots__ = ("columns", "_curve_pos", "curve", "index", "value", "salient", "all", "salient_only")
+
+    def __init__(
+        self,
+        columns: List,
+        curve: np.ndarray,
+        index: np.ndarray,
+        value: np.ndarray,
+        salient: np.ndarray,
+    ):
+        """Arrays must already be sorted by (curve, index), as in JobResult."""
+        self.columns = columns
+        self._curve_pos = {str(name): pos for pos, name in enumerate(columns)}
+        self.curve = curve
+        self.index = index
+        self.value = value
+        self.salient = salient
+
+        n = index.size
+        dtype = _perm_dtype(n)
+        counts = np.bincount(curve, minlength=len(columns))
+        curve_offsets = np.concatenate(([0], np.cumsum(counts)))
+        by_time = np.argsort(index, kind="stable").astype(dtype, copy=False)
+        by_value = np.argsort(-value, kind="stable").astype(dtype, copy=False)
+        # Within each curve range, positions sorted by descending value
+        by_curve_value = np.lexsort((-value, curve)).astype(dtype, copy=False)
+        self.all = _PeakView(None, curve_offsets, by_time, by_value, by_curve_value)
+
+        # Filtering a permutation keeps its order, so no re-sorting is needed
+        members = np.flatnonzero(salient).astype(dtype, copy=False)
+        salient_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(curve[members], minlength=len(columns))))
+        )
+        self.salient_only = _PeakView(
+            members,
+            salient_offsets,
+            by_time[salient[by_time]],
+            by_value[salient[by_value]],
+            by_curve_value[salient[by_curve_value]],
+        )
+
+    @classmethod
+    def from_result(cls, result: JobResult) -> "PeakIndex":
+        return cls(
+            result.columns,
+            result.peak_curve,
+            result.peak_index,
+            result.peak_value,
+            result.peak_salient,
+        )
+
+    @property
+    def n_peaks(self) -> int:
+        return self.index.size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes owned by the index itself (the peak arrays are shared)."""
+        total = 0
+        for view in (self.all, self.salient_only):
+            for arr in (view.members, view.curve_offsets, view.by_time, view.by_value, view.by_curve_value):
+                if arr is not None:
+                    total += arr.nbytes
+        return total
+
+    def _view(self, salient_only: bool) -> _PeakView:
+        return self.salient_only if salient_only else self.all
+
+    def curve_position(self, curve_id: Any) -> int:
+        """Map a curve id to its column position, raising KeyError if unknown."""
+        return self._curve_pos[str(curve_id)]
+
+    def _search(self, perm: np.ndarray, lo: int, hi: int, target: int) -> int:
+        # First p in perm[lo:hi] with index[perm[p]] >= target (perm is sorted by index)
+        index = self.index
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if index[perm[mid]] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _records(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                "curve_id": self.columns[c],
+                "peak_index": int(i),
+                "peak_value": float(v),
+                "is_salient": bool(s),
+            }
+            for c, i, v, s in zip(
+                self.curve[positions],
+                self.index[positions],
+                self.value[positions],
+                self.salient[positions],
+            )
+        ]
+
+    def curve_peaks(self, curve_id: Any, salient_only: bool = False) -> List[Dict[str, Any]]:
+        pos = self.curve_position(curve_id)
+        return self._records(self._view(salient_only).curve_members(pos))
+
+    def window(
+        self,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+        curve_id: Any = None,
+        salient_only: bool = False,
+    ) -> List[Dict[str, Any]]:
+        view = self._view(salient_only)
+        if curve_id is not None:
+            pos = self.curve_position(curve_id)
+            if view.members is None:
+                # A curve's peaks are a contiguous range sorted by peak_index
+                first, last = int(view.curve_offsets[pos]), int(view.curve_offsets[pos + 1])
+                times = self.index[first:last]
+                lo = 0 if start is None else int(np.searchsorted(times, start, "left"))
+                hi = times.size if stop is None else int(np.searchsorted(times, stop, "left"))
+                return self._records(np.arange(first + lo, first + max(lo, hi)))
+
+            members = view.curve_members(pos)
+            lo = 0 if start is None else self._search(members, 0, members.size, start)
+            hi = members.size if stop is None else self._search(members, lo, members.size, stop)
+            return self._records(members[lo:hi])
+
+        lo = 0 if start is None else self._search(view.by_time, 0, view.size, start)
+        hi = view.size if stop is None else self._search(view.by_time, lo, view.size, stop)
+        return self._records(view.by_time[lo:hi])
+
+    def top_k(
+        self,
+        k: int,
+        curve_id: Any = None,
+        salient_only: bool = False,
+    ) -> List[Dict[str, Any]]:
+        view = self._view(salient_only)
+        if curve_id is not None:
+            positions = view.curve_by_value(self.curve_position(curve_id))[:k]
+        else:
+            positions = view.by_value[:k]
+        return self._records(positions)
@@ -0,0 +1,158 @@
+# service/results.py
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+ANNOTATION_COLUMNS = ["curve_id", "peak_index", "peak_value", "is_salient"]
+
+
+class JobResult:
+    """
+    Compact, array-backed storage for a finished job.
+
+    Preprocessed curves are kept as one contiguous (n_samples, n_curves)
+    float matrix plus column names; annotations are kept as parallel arrays
+    with curve ids encoded as positions into ``columns``, sorted by
+    (curve, peak_index) so indexes can use them in place. DataFrames are only
+    materialized on request via ``to_preprocessed_df`` / ``to_annotations_df``.
+    """
+
+    __slots__ = (
+        "values",
+        "columns",
+        "index",
+        "peak_curve",
+        "peak_index",
+        "peak_value",
+        "peak_salient",
+        "row_step",
+        "row_offset",
+    )
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        columns: List,
+        index: Optional[np.ndarray],
+        peak_curve: np.ndarray,
+        peak_index: np.ndarray,
+        peak_value: np.ndarray,
+        peak_salient: np.ndarray,
+        row_step: int = 1,
+        row_offset: int = 0,
+    ):
+        self.values = values
+        self.columns = columns
+        # None means a default RangeIndex(0, n_samples)
+        self.index = index
+        self.peak_curve = peak_curve
+        self.peak_index = peak_index
+        self.peak_value = peak_value
+        self.peak_salient = peak_salient
+        # Matrix row r is original row r * row_step + row_offset (previews
+        # store decimated rows); peak_index is always in original rows.
+        self.row_step = row_step
+        self.row_offset = row_offset
+
+    @classmethod
+    def from_dataframes(
+        cls,
+        preprocessed_df: pd.DataFrame,
+        annotations_df: pd.DataFrame,
+        float32: bool = False,
+    ) -> "JobResult":
+        dtype = np.float32 if float32 else np.float64
+        values = np.ascontiguousarray(preprocessed_df.to_numpy(dtype=dtype))
+        columns = list(preprocessed_df.columns)
+
+        idx = preprocessed_df.index
+        if isinstance(idx, pd.RangeIndex) and idx.start == 0 and idx.step == 1:
+            index = None
+        else:
+            index = idx.to_numpy()
+
+        if annotations_df.empty:
+            peak_curve = np.empty(0, dtype=np.int32)
+            peak_index = np.empty(0, dtype=np.int64)
+            peak_value = np.empty(0, dtype=dtype)
+            peak_salient = np.empty(0, dtype=bool)
+        else:
+            peak_curve = pd.Index(columns).get_indexer(annotations_df["curve_id"])
+            if (peak_curve < 0).any():
+                unknown = annotations_df["curve_id"][peak_curve < 0].unique().tolist()
+                raise ValueError(f"Annotations reference unknown curves: {unknown}")
+            peak_curve = peak_curve.astype(np.int32)
+            peak_index = annotations_df["peak_index"].to_numpy(dtype=np.int64)
+            peak_value = annotations_df["peak_value"].to_numpy(dtype=dtype)
+            peak_salient = annotations_df["is_salient"].to_numpy(dtype=bool)
+
+            order = np.lexsort((peak_index, peak_curve))
+            peak_curve = peak_curve[order]
+            peak_index = peak_index[order]
+            peak_value = peak_value[order]
+            peak_salient = peak_salient[order]
+
+        return cls(
+            values,
+            columns,
+            index,
+            peak_curve,
+            peak_index,
+            peak_value,
+            peak_salient,
+            row_step=int(preprocessed_df.attrs.get("preview_factor", 1)),
+            row_offset=int(preprocessed_df.attrs.get("row_offset", 0)),
+        )
+
+    @property
+    def n_curves(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def n_peaks(self) -> int:
+        return self.peak_index.size
+
+    @property
+    def nbytes(self) -> int:
+        total = (
+            self.values.nbytes
+            + self.peak_curve.nbytes
+            + self.peak_index.nbytes
+            + self.peak_value.nbytes
+            + self.peak_salient.nbytes
+        )
+        if self.index is not None:
+            total += self.index.nbytes
+        return total
+
+    def to_rows(self, position: int) -> int:
+        """First matrix row at or after original row `position`."""
+        return max(0, -(-(position - self.row_offset) // self.row_step))
+
+    def to_preprocessed_df(self) -> pd.DataFrame:
+        if self.index is None:
+            index = pd.RangeIndex(self.values.shape[0])
+        else:
+            index = pd.Index(self.index)
+        return pd.DataFrame(
+            self.values.astype(np.float64, copy=False),
+            columns=self.columns,
+            index=index,
+        )
+
+    def to_annotations_df(self) -> pd.DataFrame:
+        if self.n_peaks == 0:
+            return pd.DataFrame(columns=ANNOTATION_COLUMNS)
+        names = np.empty(len(self.columns), dtype=object)
+        for i, name in enumerate(self.columns):
+            names[i] = name
+        curve_ids = names[self.peak_curve]
+        return pd.DataFrame(
+            {
+                "curve_id": curve_ids,
+                "peak_index": self.peak_index,
+                "peak_value": self.peak_value.astype(np.float64, copy=False),
+                "is_salient": self.peak_salient,
+            }
+        )
@@ -0,0 +1,297 @@
+# service/scheduler.py
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
+
+from .models import PreprocessRequest
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+
+# Bytes sampled from the top of the CSV to estimate row count
+_HEADER_SCAN_BYTES = 64 * 1024
+
+
+@dataclass
+class CostEstimate:
+    file_bytes: int
+    n_rows: int
+    n_curves: int
+    raw_seconds: float  # before calibration
+    seconds: float
+
+
+class CostModel:
+    """
+    Linear cost model for a preprocessing job.
+
+    The raw estimate is ``cells * (parse + smooth * window + peaks)`` with
+    ``cells = rows * curves / preview_factor`` (parsing is not reduced by
+    preview), plus a fixed overhead. It is multiplied by a calibration
+    factor: the median ratio of actual to raw estimated seconds over the
+    most recent finished jobs.
+    """
+
+    def __init__(
+        self,
+        overhead_s: float = 0.005,
+        parse_s_per_cell: float = 2e-7,
+        smooth_s_per_cell_window: float = 2e-9,
+        peaks_s_per_cell: float = 3e-7,
+        interactive_threshold_s: float = 1.0,
+        history: int = 200,
+    ):
+        self.overhead_s = overhead_s
+        self.parse_s_per_cell = parse_s_per_cell
+        self.smooth_s_per_cell_window = smooth_s_per_cell_window
+        self.peaks_s_per_cell = peaks_s_per_cell
+        self.interactive_threshold_s = interactive_threshold_s
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self.scale = 1.0
+
+    def scan(self, path: str, time_index_column: Optional[str] = None) -> Tuple[int, int, int]:
+        """
+        Cheap header scan: (file_bytes, estimated_rows, n_curves).
+
+        Reads only the first block of the file; the row count is the file
+        size divided by the average line length in that block.
+        """
+        try:
+            file_bytes = os.path.getsize(path)
+            with open(path, "rb") as f:
+                head = f.read(_HEADER_SCAN_BYTES)
+        except OSError:
+            # Let the pipeline report the real error; an unreadable file is cheap
+            return 0, 0, 0
+
+        lines = head.splitlines()
+        if not lines:
+            return file_bytes, 0, 0
+        header = lines[0].decode("utf-8", errors="replace").split(",")
+        n_curves = max(0, len(header) - 1)  # first column is the index
+        if time_index_column is not None and time_index_column in header[1:]:
+            n_curves -= 1
+
+        body = lines[1:]
+        if len(head) < file_bytes and body:
+            # Drop the last line, it is likely cut off by the scan
+            body = body[:-1] or body
+            avg_line = sum(len(line) + 1 for line in body) / len(body)
+            n_rows = int((file_bytes - len(lines[0]) - 1) / avg_line)
+        else:
+            n_rows = len(body)
+        return file_bytes, n_rows, n_curves
+
+    def raw_seconds(self, n_rows: int, n_curves: int, req: PreprocessRequest) -> float:
+        cells = float(n_rows) * n_curves
+        compute_cells = cells / max(1, req.preview_factor)
+        window = max(1, req.smoothing_window // max(1, req.preview_factor))
+        return (
+            self.overhead_s
+            + cells * self.parse_s_per_cell
+            + compute_cells * (self.smooth_s_per_cell_window * window + self.peaks_s_per_cell)
+        )
+
+    def estimate(self, req: PreprocessRequest) -> CostEstimate:
+        file_bytes, n_rows, n_curves = self.scan(req.csv_path, req.time_index_column)
+        raw = self.raw_seconds(n_rows, n_curves, req)
+        return CostEstimate(file_bytes, n_rows, n_curves, raw, raw * self.scale)
+
+    def lane_for(self, estimate: CostEstimate) -> str:
+        return INTERACTIVE if estimate.seconds <= self.interactive_threshold_s else BATCH
+
+    def record(self, estimate: CostEstimate, actual_seconds: Optional[float]) -> None:
+        """Record an (estimated, actual) pair and refresh the calibration factor."""
+        if actual_seconds is None or estimate.raw_seconds <= 0:
+            return
+        with self._lock:
+            self._samples.append((estimate.raw_seconds, actual_seconds))
+            ratios = sorted(actual / raw for raw, actual in self._samples if raw > 0)
+            if ratios:
+                self.scale = ratios[len(ratios) // 2]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"scale": self.scale, "samples": len(self._samples)}
+
+
+class SchedulerFull(RuntimeError):
+    """Raised when a job would have to wait but the waiting queue is full."""
+
+
+@dataclass
+class _Ticket:
+    seq: int
+    client_id: Optional[str]
+    lane: str
+    cost: float
+    submitted_at: float
+
+
+class JobScheduler:
+    """
+    Admission control for running jobs.
+
+    Jobs wait in ``slot`` until the scheduler grants them one of
+    ``max_concurrent`` run slots. Among waiting jobs that are allowed to run,
+    the one with the lowest ``cost - aging_rate * waited_seconds`` goes first
+    (short-job-first with aging, ties broken by arrival). ``reserved_interactive``
+    slots are only ever given to the interactive lane, and a client never has
+    more than ``per_client_limit`` jobs running at once. Jobs without a
+    client id are not subject to the per-client limits.
+
+    Every waiting job holds a request thread from the server's shared pool,
+    so waiting is bounded too: a job that cannot start right away is
+    rejected with ``SchedulerFull`` when ``max_waiting`` jobs are already
+    waiting, or ``max_waiting_per_client`` from the same client.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        reserved_interactive: int = 1,
+        per_client_limit: int = 2,
+        aging_rate: float = 1.0,
+        poll_interval: float = 0.5,
+        max_waiting: int = 16,
+        max_waiting_per_client: int = 4,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        if not 0 <= reserved_interactive < max_concurrent:
+            raise ValueError("reserved_interactive must be in [0, max_concurrent)")
+        self.max_concurrent = max_concurrent
+        self.reserved_interactive = reserved_interactive
+        self.per_client_limit = per_client_limit
+        self.aging_rate = aging_rate
+        self.poll_interval = poll_interval
+        self.max_waiting = max_waiting
+        self.max_waiting_per_client = max_waiting_per_client
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: List[_Ticket] = []
+        self._running: Dict[str, int] = {lane: 0 for lane in LANES}
+        self._running_by_client: Dict[str, int] = {}
+        self.rejected = 0
+
+    # Constructor argument -> environment variable, for from_env
+    ENV_VARS = {
+        "max_concurrent": ("SCHEDULER_MAX_CONCURRENT", int),
+        "reserved_interactive": ("SCHEDULER_RESERVED_INTERACTIVE", int),
+        "per_client_limit": ("SCHEDULER_PER_CLIENT_LIMIT", int),
+        "aging_rate": ("SCHEDULER_AGING_RATE", float),
+        "max_waiting": ("SCHEDULER_MAX_WAITING", int),
+        "max_waiting_per_client": ("SCHEDULER_MAX_WAITING_PER_CLIENT", int),
+    }
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "JobScheduler":
+        """Scheduler with limits read from SCHEDULER_* variables (unset ones keep defaults)."""
+        environ = os.environ if environ is None else environ
+        kwargs = {}
+        for arg, (name, parse) in cls.ENV_VARS.items():
+            if environ.get(name):
+                try:
+                    kwargs[arg] = parse(environ[name])
+                except ValueError:
+                    raise ValueError(f"Invalid {name}: {environ[name]!r}") from None
+        return cls(**kwargs)
+
+    def _priority(self, ticket: _Ticket, now: float) -> Tuple[float, int]:
+        waited = now - ticket.submitted_at
+        return ticket.cost - self.aging_rate * waited, ticket.seq
+
+    def _eligible(self, ticket: _Ticket) -> bool:
+        if (
+            ticket.client_id is not None
+            and self._running_by_client.get(ticket.client_id, 0) >= self.per_client_limit
+        ):
+            return False
+        total = sum(self._running.values())
+        if total >= self.max_concurrent:
+            return False
+        if ticket.lane == BATCH:
+            return self._running[BATCH] < self.max_concurrent - self.reserved_interactive
+        return True
+
+    def _next(self, now: float) -> Optional[_Ticket]:
+        eligible = [t for t in self._waiting if self._eligible(t)]
+        if not eligible:
+            return None
+        return min(eligible, key=lambda t: self._priority(t, now))
+
+    def acquire(self, client_id: Optional[str], lane: str, cost: float) -> _Ticket:
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane: {lane!r}")
+        with self._cond:
+            ticket = _Ticket(next(self._seq), client_id, lane, cost, time.monotonic())
+            self._waiting.append(ticket)
+            if self._next(time.monotonic()) is not ticket:
+                others = len(self._waiting) - 1
+                same_client = 0
+                if client_id is not None:
+                    same_client = sum(t.client_id == client_id for t in self._waiting) - 1
+                if others >= self.max_waiting or same_client >= self.max_waiting_per_client:
+                    self._waiting.remove(ticket)
+                    self.rejected += 1
+                    raise SchedulerFull(
+                        f"Too many waiting jobs ({others} total, {same_client} for client {client_id!r})"
+                    )
+            # Priorities change as jobs age, so re-check periodically too
+            while self._next(time.monotonic()) is not ticket:
+                self._cond.wait(self.poll_interval)
+            self._waiting.remove(ticket)
+            self._running[lane] += 1
+            if client_id is not None:
+                self._running_by_client[client_id] = self._running_by_client.get(client_id, 0) + 1
+            self._cond.notify_all()
+            return ticket
+
+    def release(self, ticket: _Ticket) -> None:
+        with self._cond:
+            self._running[ticket.lane] -= 1
+            if ticket.client_id is not None:
+                remaining = self._running_by_client[ticket.client_id] - 1
+                if remaining:
+                    self._running_by_client[ticket.client_id] = remaining
+                else:
+                    del self._running_by_client[ticket.client_id]
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, client_id: Optional[str], lane: str, cost: float):
+        ticket = self.acquire(client_id, lane, cost)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            waiting = {lane: 0 for lane in LANES}
+            for t in self._waiting:
+                waiting[t.lane] += 1
+            return {
+                "running": dict(self._running),
+                "waiting": waiting,
+                "running_by_client": dict(self._running_by_client),
+                "rejected": self.rejected,
+            }
+
+
+cost_model = CostModel()
+scheduler = JobScheduler.from_env()
+
+
+def route(req: PreprocessRequest) -> Tuple[CostEstimate, str]:
+    """Estimate a request's cost and pick its lane (explicit lane wins)."""
+    estimate = cost_model.estimate(req)
+    return estimate, req.lane or cost_model.lane_for(estimate)
@@ -20,6 +20,7 @@ setup(
     extras_require={
         "dev": [
             "pytest>=7.0",
+            "httpx",
         ],
     },
 )
\ No newline at end of file
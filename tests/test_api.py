@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from main import app
+from service.scheduler import INTERACTIVE, scheduler
+
+client = TestClient(app)
+
+
+def _write_csv(tmp_path, n=20000):
+    rng = np.random.default_rng(5)
+    t = np.arange(n)
+    df = pd.DataFrame(
+        {f"c{i}": np.sin(2 * np.pi * t / (900 + 150 * i)) + 0.1 * rng.standard_normal(n) for i in range(2)}
+    )
+    path = tmp_path / "series.csv"
+    df.to_csv(path)
+    return str(path)
+
+
+def test_preview_peaks_and_curves_share_original_rows(tmp_path):
+    csv_path = _write_csv(tmp_path)
+    job = client.post(
+        "/v1/jobs",
+        json={
+            "csv_path": csv_path,
+            "preview_factor": 10,
+            "build_pyramid": True,
+            "smoothing_window": 51,
+            "min_peak_distance": 300,
+        },
+    ).json()
+    assert job["status"] == "SUCCESS" and job["approximate"]
+    job_id = job["job_id"]
+
+    top = client.get(f"/v1/jobs/{job_id}/peaks/top", params={"k": 1}).json()["peaks"][0]
+    # Original rows: block means sit at block centres r * 10 + 5
+    assert top["peak_index"] % 10 == 5
+
+    # The peak found by the index can be looked up on its curve
+    env = client.get(
+        f"/v1/jobs/{job_id}/curves/{top['curve_id']}",
+        params={"start": top["peak_index"] - 100, "stop": top["peak_index"] + 100},
+    ).json()
+    assert env["bucket_size"] == 10
+    assert top["peak_index"] in env["x"]
+    at_peak = env["x"].index(top["peak_index"])
+    assert np.isclose(env["y_max"][at_peak], top["peak_value"])
+    assert all(top["peak_index"] - 100 <= x < top["peak_index"] + 100 for x in env["x"])
+
+    # The whole curve maps onto the original row range
+    full = client.get(f"/v1/jobs/{job_id}/curves/c0", params={"max_points": 100}).json()
+    assert full["x"][0] == 5 and full["x"][-1] + full["bucket_size"] >= 20000
+    assert len(full["x"]) * 2 <= 100
+
+    results = client.get(f"/v1/jobs/{job_id}/results").json()
+    assert results["row_step"] == 10 and results["row_offset"] == 5
+
+
+def test_invalid_options_are_rejected_before_a_job_runs(tmp_path):
+    csv_path = _write_csv(tmp_path, n=100)
+    for body in ({"preview_factor": 0}, {"preview_method": "median"}, {"lane": "urgent"}):
+        resp = client.post("/v2/preprocess", json={"csv_path": csv_path, **body})
+        assert resp.status_code == 422
+
+
+def test_full_waiting_queue_is_rejected_with_429(tmp_path, monkeypatch):
+    csv_path = _write_csv(tmp_path, n=100)
+    held = [scheduler.acquire(f"holder{i}", INTERACTIVE, 0.0) for i in range(scheduler.max_concurrent)]
+    monkeypatch.setattr(scheduler, "max_waiting", 0)
+    try:
+        resp = client.post("/v1/jobs", json={"csv_path": csv_path})
+        assert resp.status_code == 429
+    finally:
+        for ticket in held:
+            scheduler.release(ticket)
+    assert client.post("/v1/jobs", json={"csv_path": csv_path}).status_code == 200
@@ -0,0 +1,51 @@
+import numpy as np
+
+from timeseries_preproc.downsampling import MinMaxPyramid, minmax_envelope
+
+
+def test_minmax_envelope_partial_bucket_and_nan():
+    values = np.array([[1.0], [3.0], [np.nan], [2.0], [5.0]])
+    mins, maxs = minmax_envelope(values, bucket=2)
+
+    assert np.allclose(mins[:, 0], [1.0, 2.0, 5.0])
+    assert np.allclose(maxs[:, 0], [3.0, 2.0, 5.0])
+
+
+def test_pyramid_levels_match_direct_envelope():
+    rng = np.random.default_rng(2)
+    values = rng.standard_normal((1001, 3))
+    pyramid = MinMaxPyramid(values, min_bucket=4)
+
+    assert pyramid.bucket_sizes[:4] == [1, 4, 8, 16]
+    assert pyramid.mins[-1].shape[0] == 1
+    for level, size in enumerate(pyramid.bucket_sizes[1:], start=1):
+        mins, maxs = minmax_envelope(values, size)
+        assert np.allclose(pyramid.mins[level], mins)
+        assert np.allclose(pyramid.maxs[level], maxs)
+
+
+def test_pyramid_query_respects_point_budget():
+    values = np.sin(np.linspace(0, 50, 100_000))[:, None]
+    pyramid = MinMaxPyramid(values)
+
+    size, x, y_min, y_max = pyramid.query(0, max_points=500)
+    assert 2 * x.size <= 500
+    assert size > 1
+    assert np.isclose(y_min.min(), values.min()) and np.isclose(y_max.max(), values.max())
+
+    # A narrow window falls back to raw samples
+    size, x, y_min, y_max = pyramid.query(0, start=100, stop=300, max_points=500)
+    assert size == 1
+    assert np.array_equal(x, np.arange(100, 300))
+    assert np.array_equal(y_min, values[100:300, 0])
+
+
+def test_pyramid_query_unaligned_start_stays_within_budget():
+    values = np.arange(10_000, dtype=float)[:, None]
+    pyramid = MinMaxPyramid(values)
+
+    for start, stop, max_points in [(3, 203, 100), (3, 4003, 1000), (5, 9999, 64)]:
+        size, x, y_min, y_max = pyramid.query(0, start, stop, max_points)
+        assert 2 * x.size <= max_points
+        # The returned buckets still cover the requested range
+        assert x[0] <= start and x[-1] + size >= stop
@@ -0,0 +1,10 @@
+import numpy as np
+
+from timeseries_preproc.gaps import missing_columns
+
+
+def test_missing_columns():
+    values = np.array([[1.0, np.nan, 3.0], [4.0, 5.0, np.inf]])
+    assert list(missing_columns(values)) == [False, True, True]
+    assert missing_columns(values[:, 1]) and not missing_columns(values[:, 0])
+    assert not missing_columns(np.empty((0, 2))).any()
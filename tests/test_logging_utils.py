@@ -0,0 +1,135 @@
+import io
+import json
+import logging
+import threading
+
+from service.logging_utils import AsyncEventLogger
+
+
+def _make_target(name):
+    stream = io.StringIO()
+    target = logging.getLogger(name)
+    target.setLevel(logging.INFO)
+    target.propagate = False
+    target.handlers = [logging.StreamHandler(stream)]
+    return target, stream
+
+
+def _records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines() if line]
+
+
+def test_events_are_written_in_order_after_flush():
+    target, stream = _make_target("test_async_log_order")
+    events = AsyncEventLogger(target)
+
+    for i in range(50):
+        events.log("tick", job_id="job", i=i)
+    assert events.flush()
+    events.shutdown()
+
+    records = _records(stream)
+    assert [r["i"] for r in records] == list(range(50))
+    assert records[0]["event"] == "tick" and records[0]["timestamp"].endswith("Z")
+    assert events.stats()["written"] == 50
+
+
+def test_full_queue_drops_and_counts():
+    target, stream = _make_target("test_async_log_full")
+    events = AsyncEventLogger(target, max_queue=10, busy_sample_every=1)
+
+    # Hold the writer inside its first batch so the queue fills up
+    entered = threading.Event()
+    release = threading.Event()
+
+    class Blocking(logging.Handler):
+        def emit(self, record):
+            entered.set()
+            release.wait(5)
+
+    target.addHandler(Blocking())
+    events.log("first", job_id="job")
+    assert entered.wait(5)
+    accepted = sum(events.log("tick", job_id="job") for _ in range(30))
+
+    assert accepted == 10
+    assert events.stats()["dropped_full"] == 20
+
+    release.set()
+    events.shutdown()
+    records = _records(stream)
+    assert any(r["event"] == "log_events_dropped" and r["dropped_full"] == 20 for r in records)
+
+
+def test_busy_queue_samples_but_keeps_failures():
+    target, _ = _make_target("test_async_log_busy")
+    events = AsyncEventLogger(target, max_queue=100, busy_fraction=0.0, busy_sample_every=4)
+    events.start()
+
+    kept = sum(events.log("tick", job_id="job") for _ in range(40))
+    assert kept == 10
+    assert events.stats()["dropped_sampled"] == 30
+    assert events.log("job_failed", job_id="job")
+    events.shutdown()
+
+
+def test_shutdown_drains_full_queue_and_counts_late_events():
+    target, stream = _make_target("test_async_log_shutdown")
+    events = AsyncEventLogger(target, max_queue=10, busy_sample_every=1)
+
+    entered = threading.Event()
+    release = threading.Event()
+
+    class Blocking(logging.Handler):
+        def emit(self, record):
+            entered.set()
+            release.wait(5)
+
+    target.addHandler(Blocking())
+    events.log("first", job_id="job")
+    assert entered.wait(5)
+    for i in range(10):
+        assert events.log("tick", job_id="job", i=i)
+
+    # The queue is full when shutdown starts; it must still drain
+    threading.Timer(0.1, release.set).start()
+    events.shutdown()
+
+    ticks = [r["i"] for r in _records(stream) if r["event"] == "tick"]
+    assert ticks == list(range(10))
+    assert not events.log("late", job_id="job")
+    stats = events.stats()
+    assert stats["dropped_closed"] == 1
+    assert stats["written"] == 11 and stats["queued"] == 0
+
+
+def test_sink_errors_are_counted():
+    class Broken(logging.Logger):
+        def info(self, msg, *args, **kwargs):
+            raise OSError("disk full")
+
+    events = AsyncEventLogger(Broken("broken"))
+    for _ in range(5):
+        events.log("tick", job_id="job")
+    assert events.flush()
+    events.shutdown()
+    assert events.stats()["dropped_sink"] == 5
+    assert events.stats()["written"] == 0
+
+
+def test_concurrent_producers_are_counted_exactly():
+    target, _ = _make_target("test_async_log_threads")
+    events = AsyncEventLogger(target, max_queue=100000)
+
+    def produce():
+        for _ in range(2000):
+            events.log("tick", job_id="job")
+
+    threads = [threading.Thread(target=produce) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    events.shutdown()
+    stats = events.stats()
+    assert stats["enqueued"] == stats["written"] == 16000
@@ -4,6 +4,7 @@ import pandas as pd
 from timeseries_preproc.config import PreprocessingConfig
 from timeseries_preproc.normalization import (
     arc_length,
+    arc_lengths,
     arc_normalize_1d,
     arc_normalize_dataframe,
 )
@@ -43,3 +44,37 @@ def test_arc_normalize_dataframe_structure():
     # so arc_normalization divides by 3 -> [1/3, 1/3, 1/3, 1/3]
     expected = np.full(4, 1.0 / 3.0)
     assert np.allclose(norm_df["curve2"].to_numpy(), expected, atol=1e-6)
+
+
+def test_arc_length_bridges_gaps():
+    x = np.array([0.0, np.nan, 2.0, 2.0])
+    # Gap bridged by one segment spanning 2 steps: sqrt(2^2 + 2^2), then 1
+    assert np.isclose(arc_length(x), np.sqrt(8.0) + 1.0)
+
+
+def test_arc_normalize_dataframe_with_nans_keeps_curve():
+    df = pd.DataFrame(
+        {
+            "curve1": [0.0, 1.0, np.nan, 3.0],
+            "curve2": [1.0, 1.0, 1.0, 1.0],
+        }
+    )
+    config = PreprocessingConfig(arc_normalization=True)
+    norm_df = arc_normalize_dataframe(df, config)
+
+    expected = df["curve1"].to_numpy() / arc_length(df["curve1"].to_numpy())
+    assert np.allclose(norm_df["curve1"].to_numpy(), expected, equal_nan=True)
+    assert np.isnan(norm_df["curve1"]).sum() == 1
+    assert np.allclose(norm_df["curve2"].to_numpy(), 1.0 / 3.0)
+
+
+def test_arc_lengths_matches_arc_length_for_gappy_columns():
+    rng = np.random.default_rng(3)
+    values = rng.standard_normal((200, 5))
+    values[rng.random(values.shape) < 0.3] = np.nan
+    values[:, 0] = np.nan  # all missing
+    values[:, 1] = rng.standard_normal(200)  # no gaps
+    values[:-1, 2] = np.nan  # a single valid sample
+
+    expected = [arc_length(values[:, pos], dt=2.0) for pos in range(values.shape[1])]
+    assert np.allclose(arc_lengths(values, dt=2.0), expected)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from service.peak_index import PeakIndex
+from service.results import JobResult
+from timeseries_preproc.config import PreprocessingConfig
+from timeseries_preproc.pipeline import preprocess_dataframe
+
+
+def _build_index():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({f"c{i}": rng.standard_normal(500) for i in range(5)})
+    config = PreprocessingConfig(smoothing_window=3, min_peak_distance=2)
+    pre_df, ann_df = preprocess_dataframe(df, config)
+    result = JobResult.from_dataframes(pre_df, ann_df)
+    index = PeakIndex.from_result(result)
+    assert index.index is result.peak_index
+    return index, ann_df
+
+
+def _key(records):
+    return sorted((r["curve_id"], r["peak_index"]) for r in records)
+
+
+def test_window_matches_scan():
+    index, ann = _build_index()
+
+    got = index.window(100, 200)
+    expected = ann[(ann["peak_index"] >= 100) & (ann["peak_index"] < 200)]
+    assert _key(got) == sorted(zip(expected["curve_id"], expected["peak_index"]))
+    assert [r["peak_index"] for r in got] == sorted(r["peak_index"] for r in got)
+
+    got = index.window(100, 200, curve_id="c2", salient_only=True)
+    mask = (
+        (ann["curve_id"] == "c2")
+        & ann["is_salient"]
+        & (ann["peak_index"] >= 100)
+        & (ann["peak_index"] < 200)
+    )
+    assert _key(got) == sorted(zip(ann.loc[mask, "curve_id"], ann.loc[mask, "peak_index"]))
+
+
+def test_top_k_matches_scan():
+    index, ann = _build_index()
+
+    got = index.top_k(10)
+    expected = ann.nlargest(10, "peak_value")["peak_value"].to_numpy()
+    assert np.allclose([r["peak_value"] for r in got], expected)
+
+    got = index.top_k(3, curve_id="c0")
+    expected = ann[ann["curve_id"] == "c0"].nlargest(3, "peak_value")["peak_value"]
+    assert np.allclose([r["peak_value"] for r in got], expected.to_numpy())
+    assert {r["curve_id"] for r in got} == {"c0"}
+
+
+def test_curve_peaks_and_unknown_curve():
+    index, ann = _build_index()
+
+    got = index.curve_peaks("c4")
+    assert [r["peak_index"] for r in got] == sorted(ann.loc[ann["curve_id"] == "c4", "peak_index"])
+
+    with pytest.raises(KeyError):
+        index.curve_peaks("missing")
+
+
+def test_index_shares_result_arrays():
+    index, ann = _build_index()
+
+    # Peak arrays are the result's own; the index only adds int32 positions:
+    # three permutations over all peaks, and over salient peaks the members
+    # plus three permutations, along with one offsets array per view
+    salient = ann[ann["is_salient"]]
+    offsets = 2 * (len(index.columns) + 1) * 8
+    assert index.nbytes == 3 * 4 * len(ann) + 4 * 4 * len(salient) + offsets
+    assert index.all.by_time.dtype == np.int32
+    assert index.salient_only.size == len(salient)
+    assert _key(index.window(salient_only=True)) == sorted(zip(salient["curve_id"], salient["peak_index"]))
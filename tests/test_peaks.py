@@ -2,7 +2,7 @@ import numpy as np
 import pandas as pd
 
 from timeseries_preproc.config import PreprocessingConfig
-from timeseries_preproc.peaks import find_peaks_1d, annotate_peaks_dataframe
+from timeseries_preproc.peaks import find_peaks_1d, find_peaks_sorted, annotate_peaks_dataframe
 
 
 def test_find_peaks_simple():
@@ -47,3 +47,29 @@ def test_annotate_peaks_dataframe_salient_flag():
     salient = annotations[annotations["is_salient"]]
     assert salient.shape[0] == 1
     assert np.isclose(salient["peak_value"].iloc[0], 4.0)
+
+
+def test_find_peaks_ignores_masked_samples():
+    # The NaN hides index 2; neighbours of index 3 are 1.0 and 0.0
+    x = np.array([0.0, 1.0, np.nan, 3.0, 0.0, 2.0, np.nan, 1.0])
+    idx, vals = find_peaks_1d(x, min_distance=1, min_rel_height=0.5)
+
+    assert np.all(idx == np.array([3, 5]))
+    assert np.allclose(vals, [3.0, 2.0])
+
+
+def test_annotate_peaks_dataframe_matches_per_curve_search():
+    rng = np.random.default_rng(4)
+    values = rng.standard_normal((500, 4)).cumsum(axis=0)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:, 0] = np.nan
+    df = pd.DataFrame(values, columns=["a", "b", "c", "d"])
+
+    for backend, find_peaks in (("occupancy", find_peaks_1d), ("sorted", find_peaks_sorted)):
+        config = PreprocessingConfig(min_peak_distance=4, min_rel_height=0.2, peaks_backend=backend)
+        ann = annotate_peaks_dataframe(df, config)
+        for col in df.columns:
+            idx, vals = find_peaks(df[col].to_numpy(), min_distance=4, min_rel_height=0.2)
+            curve = ann[ann["curve_id"] == col]
+            assert np.array_equal(curve["peak_index"].to_numpy(), idx)
+            assert np.allclose(curve["peak_value"].to_numpy(), vals)
@@ -43,3 +43,38 @@ def test_preprocess_dataframe_end_to_end():
 
     # Any annotated curve_id should be in the original columns
     assert set(annotations["curve_id"]).issubset(set(df.columns))
+
+
+def test_preprocess_dataframe_with_gaps():
+    t = np.arange(200)
+    curve = np.sin(t / 10.0)
+    gappy = curve.copy()
+    gappy[[20, 21, 90, 150]] = np.nan
+    df = pd.DataFrame({"clean": curve, "gappy": gappy})
+
+    config = PreprocessingConfig(smoothing_window=5, arc_normalization=True, min_peak_distance=5)
+    preprocessed, annotations = preprocess_dataframe(df, config)
+
+    # Gaps shorter than the window are filled and do not poison the curve
+    assert np.all(np.isfinite(preprocessed["gappy"].to_numpy()))
+    clean_peaks = annotations.loc[annotations["curve_id"] == "clean", "peak_index"].tolist()
+    gappy_peaks = annotations.loc[annotations["curve_id"] == "gappy", "peak_index"].tolist()
+    assert gappy_peaks == clean_peaks
+
+
+def test_preprocess_dataframe_never_reports_peaks_at_missing_samples():
+    t = np.arange(1000)
+    curve = np.sin(2 * np.pi * t / 62.5)
+    true_peaks = np.flatnonzero((curve[1:-1] > curve[:-2]) & (curve[1:-1] > curve[2:])) + 1
+    gappy = curve.copy()
+    gappy[true_peaks] = np.nan
+    gappy[true_peaks[::2] + 1] = np.inf  # coerced "inf" strings are missing too
+    df = pd.DataFrame({"gappy": gappy})
+
+    config = PreprocessingConfig(smoothing_window=5, min_peak_distance=5)
+    _, annotations = preprocess_dataframe(df, config)
+
+    assert len(annotations) > 0
+    missing = np.flatnonzero(~np.isfinite(gappy))
+    assert not np.isin(annotations["peak_index"], missing).any()
+    assert np.all(np.isfinite(annotations["peak_value"]))
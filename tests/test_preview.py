@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from timeseries_preproc.config import PreprocessingConfig
+from timeseries_preproc.decimation import decimate_dataframe
+from timeseries_preproc.io import load_timeseries_csv
+from timeseries_preproc.pipeline import preprocess_dataframe
+
+
+def _noisy_sines(n=20000, n_curves=4, seed=3):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return pd.DataFrame(
+        {
+            f"c{i}": np.sin(2 * np.pi * t / (800 + 100 * i)) + 0.2 * rng.standard_normal(n)
+            for i in range(n_curves)
+        }
+    )
+
+
+def _matched(a, b, tol):
+    # Number of peaks in `a` with a peak on the same curve in `b` within tol
+    hits = 0
+    for curve_id, group in a.groupby("curve_id"):
+        other = b.loc[b["curve_id"] == curve_id, "peak_index"].to_numpy()
+        for p in group["peak_index"]:
+            hits += bool(np.any(np.abs(other - p) <= tol))
+    return hits
+
+
+def test_decimate_dataframe_mean_and_stride():
+    df = pd.DataFrame({"a": [1.0, 3.0, np.nan, 5.0, 7.0]}, index=[10, 11, 12, 13, 14])
+
+    # Block means are labelled with the block centre; the partial last
+    # block is labelled with its only row
+    means = decimate_dataframe(df, 2, "mean")
+    assert list(means.index) == [11, 13, 14]
+    assert np.allclose(means["a"].to_numpy(), [2.0, 5.0, 7.0])
+
+    strided = decimate_dataframe(df, 2, "stride")
+    assert list(strided.index) == [10, 12, 14]
+
+
+def test_preview_loader_matches_in_memory_decimation(tmp_path):
+    df = _noisy_sines(n=1000, n_curves=2)
+    path = tmp_path / "series.csv"
+    df.to_csv(path)
+
+    config = PreprocessingConfig(preview_factor=7)
+    loaded = load_timeseries_csv(path, config=config)
+    expected = decimate_dataframe(load_timeseries_csv(path), 7, "mean")
+    pd.testing.assert_frame_equal(loaded, expected)
+
+
+def test_preview_peaks_recall_and_precision():
+    df = _noisy_sines()
+    base = dict(smoothing_window=101, min_peak_distance=200, min_rel_height=0.3)
+    _, full = preprocess_dataframe(df, PreprocessingConfig(**base))
+
+    pre, preview = preprocess_dataframe(
+        df, PreprocessingConfig(**base, preview_factor=10, preview_method="mean")
+    )
+    assert preview.attrs["approximate"] and pre.attrs["preview_factor"] == 10
+    assert pre.shape == (2000, 4)
+    # Row labels follow the same convention as row_offset and peak_index
+    expected_rows = np.arange(2000) * 10 + pre.attrs["row_offset"]
+    assert np.array_equal(pre.index.to_numpy(), expected_rows)
+
+    recall = _matched(full, preview, tol=30) / len(full)
+    precision = _matched(preview, full, tol=30) / len(preview)
+    assert recall >= 0.9
+    assert precision >= 0.9
+
+    # Striding aliases the noise, so it is noticeably less accurate
+    _, strided = preprocess_dataframe(
+        df, PreprocessingConfig(**base, preview_factor=10, preview_method="stride")
+    )
+    assert _matched(full, strided, tol=30) / len(full) >= 0.6
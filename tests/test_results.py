@@ -0,0 +1,87 @@
+import gc
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from service.jobs import JobRecord
+from service.results import JobResult
+from timeseries_preproc.config import PreprocessingConfig
+from timeseries_preproc.pipeline import preprocess_dataframe
+
+
+def _make_result_frames(n=2000, n_curves=8):
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 20 * np.pi, n)
+    df = pd.DataFrame(
+        {f"curve{i}": np.sin(t * (i + 1) / 4) + 0.1 * rng.standard_normal(n) for i in range(n_curves)}
+    )
+    config = PreprocessingConfig(smoothing_window=5, min_peak_distance=3)
+    return preprocess_dataframe(df, config)
+
+
+def test_job_result_round_trip():
+    pre_df, ann_df = _make_result_frames()
+    result = JobResult.from_dataframes(pre_df, ann_df)
+
+    pd.testing.assert_frame_equal(result.to_preprocessed_df(), pre_df)
+    pd.testing.assert_frame_equal(
+        result.to_annotations_df(), ann_df.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_job_result_float32_and_empty_annotations():
+    pre_df = pd.DataFrame({"a": [0.0, 1.0, 2.0]}, index=[10, 20, 30])
+    ann_df = pd.DataFrame(columns=["curve_id", "peak_index", "peak_value", "is_salient"])
+    result = JobResult.from_dataframes(pre_df, ann_df, float32=True)
+
+    assert result.values.dtype == np.float32
+    assert result.n_peaks == 0
+    assert list(result.to_preprocessed_df().index) == [10, 20, 30]
+    assert result.to_annotations_df().empty
+
+
+def _retained_bytes(build):
+    """Bytes still allocated while the object returned by `build` is alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return retained
+
+
+def test_job_result_retains_less_memory_than_dataframes():
+    # Memory a job keeps alive after preprocessing a 20000 x 8 frame
+    def with_dataframes():
+        # What a job used to hold: the pipeline's DataFrames
+        return _make_result_frames(n=20000)
+
+    def with_result(float32=False):
+        job = JobRecord("job")
+        job.result = JobResult.from_dataframes(*_make_result_frames(n=20000), float32=float32)
+        return job
+
+    df_bytes = _retained_bytes(with_dataframes)
+    result_bytes = _retained_bytes(with_result)
+    result32_bytes = _retained_bytes(lambda: with_result(float32=True))
+
+    assert result_bytes < df_bytes
+    assert result32_bytes < result_bytes
+
+    job = JobRecord("job")
+    assert not hasattr(job, "__dict__")
+
+
+def test_job_result_rejects_unknown_curve_ids():
+    pre_df, ann_df = _make_result_frames(n=200, n_curves=2)
+    ann_df = ann_df.copy()
+    ann_df.loc[ann_df.index[0], "curve_id"] = "missing"
+    with pytest.raises(ValueError, match="missing"):
+        JobResult.from_dataframes(pre_df, ann_df)
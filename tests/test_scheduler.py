@@ -0,0 +1,149 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from service.models import PreprocessRequest
+from service.scheduler import BATCH, INTERACTIVE, CostModel, JobScheduler, SchedulerFull
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _run_in_order(scheduler, jobs):
+    """Queue (name, client, lane, cost) jobs behind a held slot, return run order."""
+    order = []
+    holder = scheduler.acquire("holder", INTERACTIVE, 0.0)
+
+    def worker(name, client, lane, cost):
+        with scheduler.slot(client, lane, cost):
+            order.append(name)
+
+    threads = []
+    for job in jobs:
+        t = threading.Thread(target=worker, args=job)
+        t.start()
+        threads.append(t)
+        # Stagger arrivals so submission order is deterministic
+        _wait_for(lambda: sum(scheduler.stats()["waiting"].values()) == len(threads))
+        time.sleep(0.05)
+
+    scheduler.release(holder)
+    for t in threads:
+        t.join(5)
+    return order
+
+
+def test_cost_model_scan_and_calibration(tmp_path):
+    path = tmp_path / "series.csv"
+    pd.DataFrame(np.random.default_rng(0).standard_normal((20000, 3))).to_csv(path)
+
+    model = CostModel()
+    req = PreprocessRequest(csv_path=str(path))
+    estimate = model.estimate(req)
+    assert estimate.n_curves == 3
+    assert abs(estimate.n_rows - 20000) / 20000 < 0.05
+
+    for actual in (2.0, 3.0, 4.0):
+        model.record(estimate, actual * estimate.raw_seconds)
+    assert np.isclose(model.scale, 3.0)
+    assert np.isclose(model.estimate(req).seconds, 3.0 * estimate.raw_seconds, rtol=1e-6)
+
+
+def test_short_jobs_first_with_aging():
+    scheduler = JobScheduler(max_concurrent=1, reserved_interactive=0, aging_rate=0.0)
+    order = _run_in_order(scheduler, [("big", "a", BATCH, 100.0), ("small", "b", BATCH, 1.0)])
+    assert order == ["small", "big"]
+
+    # With strong aging the earlier (big) job has caught up by the time of release
+    scheduler = JobScheduler(max_concurrent=1, reserved_interactive=0, aging_rate=1e6)
+    order = _run_in_order(scheduler, [("big", "a", BATCH, 100.0), ("small", "b", BATCH, 1.0)])
+    assert order == ["big", "small"]
+
+
+def test_reserved_interactive_lane_and_client_limit():
+    scheduler = JobScheduler(max_concurrent=2, reserved_interactive=1, per_client_limit=1)
+
+    batch = scheduler.acquire("a", BATCH, 10.0)
+    # The second slot is reserved for interactive work
+    blocked = threading.Thread(target=lambda: scheduler.release(scheduler.acquire("b", BATCH, 1.0)))
+    blocked.start()
+    _wait_for(lambda: scheduler.stats()["waiting"][BATCH] == 1)
+
+    # Client "a" is at its limit even though an interactive slot is free
+    limited = threading.Thread(target=lambda: scheduler.release(scheduler.acquire("a", INTERACTIVE, 0.1)))
+    limited.start()
+    _wait_for(lambda: scheduler.stats()["waiting"][INTERACTIVE] == 1)
+
+    interactive = scheduler.acquire("c", INTERACTIVE, 0.1)
+    assert scheduler.stats()["running"] == {INTERACTIVE: 1, BATCH: 1}
+    scheduler.release(interactive)
+
+    scheduler.release(batch)
+    blocked.join(5)
+    limited.join(5)
+    assert not blocked.is_alive() and not limited.is_alive()
+    assert scheduler.stats()["running"] == {INTERACTIVE: 0, BATCH: 0}
+
+
+def test_waiting_jobs_are_bounded_per_client_and_overall():
+    scheduler = JobScheduler(
+        max_concurrent=1, reserved_interactive=0, max_waiting=2, max_waiting_per_client=1
+    )
+    holder = scheduler.acquire("holder", BATCH, 0.0)
+
+    waiters = []
+    for client in ("a", "b"):
+        t = threading.Thread(target=lambda c=client: scheduler.release(scheduler.acquire(c, BATCH, 1.0)))
+        t.start()
+        waiters.append(t)
+        _wait_for(lambda: scheduler.stats()["waiting"][BATCH] == len(waiters))
+
+    with pytest.raises(SchedulerFull):
+        scheduler.acquire("c", BATCH, 1.0)  # total limit
+    scheduler.max_waiting = 3
+    with pytest.raises(SchedulerFull):
+        scheduler.acquire("a", BATCH, 1.0)  # per-client limit
+    assert scheduler.stats()["rejected"] == 2
+
+    scheduler.release(holder)
+    for t in waiters:
+        t.join(5)
+    # Nothing waits, so a job that can start right away is always admitted
+    scheduler.max_waiting = 0
+    scheduler.release(scheduler.acquire("a", BATCH, 1.0))
+
+
+def test_jobs_without_client_id_skip_per_client_limits():
+    scheduler = JobScheduler(
+        max_concurrent=4, reserved_interactive=0, per_client_limit=1, max_waiting_per_client=0
+    )
+    held = [scheduler.acquire(None, BATCH, 1.0) for _ in range(4)]
+    assert scheduler.stats()["running_by_client"] == {}
+
+    # The global limits still apply: nothing is free and nothing may wait
+    scheduler.max_waiting = 0
+    with pytest.raises(SchedulerFull):
+        scheduler.acquire(None, BATCH, 1.0)
+    for ticket in held:
+        scheduler.release(ticket)
+    assert scheduler.stats()["running"] == {INTERACTIVE: 0, BATCH: 0}
+
+
+def test_scheduler_limits_from_env():
+    scheduler = JobScheduler.from_env(
+        {"SCHEDULER_MAX_CONCURRENT": "8", "SCHEDULER_PER_CLIENT_LIMIT": "3", "SCHEDULER_AGING_RATE": ""}
+    )
+    assert scheduler.max_concurrent == 8
+    assert scheduler.per_client_limit == 3
+    assert scheduler.aging_rate == 1.0
+    assert scheduler.max_waiting == JobScheduler().max_waiting
+
+    with pytest.raises(ValueError, match="SCHEDULER_MAX_WAITING"):
+        JobScheduler.from_env({"SCHEDULER_MAX_WAITING": "many"})
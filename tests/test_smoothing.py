@@ -2,7 +2,12 @@ import numpy as np
 import pandas as pd
 
 from timeseries_preproc.config import PreprocessingConfig
-from timeseries_preproc.smoothing import moving_average_1d, smooth_dataframe
+from timeseries_preproc.smoothing import (
+    moving_average_1d,
+    moving_average_cumsum,
+    nan_moving_average,
+    smooth_dataframe,
+)
 
 
 def test_moving_average_simple():
@@ -35,3 +40,63 @@ def test_smooth_dataframe_shape_and_columns():
 
     assert smoothed.shape == df.shape
     assert list(smoothed.columns) == ["curve1", "curve2"]
+
+
+def test_moving_average_nan_does_not_spread():
+    x = np.array([1, 2, np.nan, 4, 5, 6, 7], dtype=float)
+    y = moving_average_1d(x, window=3, center=True)
+
+    assert y.shape == x.shape
+    assert np.all(np.isfinite(y))
+    # Window around index 2 is [2, nan, 4] -> mean of valid samples
+    assert np.isclose(y[2], 3.0)
+    # Windows without the gap are unaffected
+    assert np.isclose(y[5], 6.0)
+
+
+def test_nan_moving_average_matches_convolution_without_nans():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((200, 3))
+    masked = nan_moving_average(x, window=7, center=True)
+    for j in range(3):
+        assert np.allclose(masked[:, j], moving_average_1d(x[:, j], window=7, center=True))
+
+
+def test_smooth_dataframe_mixed_gappy_and_clean_columns():
+    df = pd.DataFrame(
+        {
+            "clean": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "gappy": [1.0, np.nan, np.nan, np.nan, 5.0, 6.0],
+        }
+    )
+    config = PreprocessingConfig(smoothing_window=3, smoothing_center=True)
+    smoothed = smooth_dataframe(df, config)
+
+    assert np.allclose(smoothed["clean"], moving_average_1d(df["clean"].to_numpy(), 3))
+    # Only the sample whose whole window is missing stays NaN
+    assert np.isnan(smoothed["gappy"]).tolist() == [False, False, True, False, False, False]
+
+
+def test_inf_in_gappy_column_stays_local():
+    x = np.sin(np.linspace(0, 20, 1000))
+    x[100] = np.nan
+    x[500] = np.inf
+    df = pd.DataFrame({"gappy": x})
+    y = smooth_dataframe(df, PreprocessingConfig(smoothing_window=5))["gappy"].to_numpy()
+
+    # inf is masked like NaN, so every window still has valid samples
+    assert np.all(np.isfinite(y))
+    clean = moving_average_1d(np.sin(np.linspace(0, 20, 1000)), window=5)
+    far = np.r_[0:95, 105:495, 505:1000]
+    assert np.allclose(y[far], clean[far])
+    assert np.isclose(y[500], np.mean(x[[498, 499, 501, 502]]))
+
+
+def test_running_sums_do_not_drift_on_long_offset_signals():
+    rng = np.random.default_rng(0)
+    x = 1e6 + np.cumsum(rng.standard_normal(400_000))
+
+    expected = moving_average_1d(x, window=101)
+    got = moving_average_cumsum(x, window=101)
+    # A single running sum over the whole signal drifts by ~1e-5 here
+    assert np.max(np.abs(got - expected)) < 16 * np.spacing(1e6)
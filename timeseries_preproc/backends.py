@@ -0,0 +1,186 @@
+from __future__ import annotations
+import json
+import math
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+# Pipeline stages and the parameter that, together with the signal length,
+# decides which implementation is fastest.
+STAGES = {
+    "smoothing": "window",
+    "peaks": "min_distance",
+}
+
+AUTO = "auto"
+
+# stage -> name -> implementation, and stage -> name of the reference one
+_registry: Dict[str, Dict[str, Callable]] = {stage: {} for stage in STAGES}
+_reference: Dict[str, str] = {}
+
+# stage -> "size_bucket:param_bucket" -> name, filled by autotune/load_tuning
+_tuning: Dict[str, Dict[str, str]] = {stage: {} for stage in STAGES}
+
+
+def register(stage: str, name: str, reference: bool = False):
+    """
+    Decorator registering `fn` as implementation `name` of `stage`.
+
+    Smoothing backends take ``(x, window, center)`` and return the smoothed
+    array; peak backends take ``(x, min_distance, min_rel_height)`` and
+    return ``(peak_indices, peak_values)``. Every backend must give the same
+    result as the stage's reference implementation (up to float rounding).
+    """
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage: {stage!r}")
+
+    def decorator(fn: Callable) -> Callable:
+        _registry[stage][name] = fn
+        if reference:
+            _reference[stage] = name
+        return fn
+
+    return decorator
+
+
+def _ensure_loaded() -> None:
+    # Stage modules register their backends on import
+    from . import peaks, smoothing  # noqa: F401
+
+
+def available(stage: str) -> list[str]:
+    """Names of the registered implementations of `stage`."""
+    _ensure_loaded()
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage: {stage!r}")
+    return list(_registry[stage])
+
+
+def reference(stage: str) -> str:
+    """Name of the reference implementation of `stage`."""
+    _ensure_loaded()
+    return _reference[stage]
+
+
+def get(stage: str, name: str) -> Callable:
+    """Look up implementation `name` of `stage`."""
+    _ensure_loaded()
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage: {stage!r}")
+    try:
+        return _registry[stage][name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown {stage} backend {name!r}; available: {list(_registry[stage])}"
+        ) from None
+
+
+def _bucket(n: int, param: int) -> str:
+    return f"{max(0, int(math.log2(max(n, 1))))}:{max(0, int(math.log2(max(param, 1))))}"
+
+
+def _heuristic(stage: str, n: int, param: int) -> str:
+    if stage == "smoothing":
+        # Direct convolution costs O(n * window); running sums are O(n) but
+        # do more work per sample, so they only win for long windows
+        return "convolve" if param <= 128 else "cumsum"
+    # The occupancy mask touches O(min_distance) cells per candidate;
+    # the sorted variant costs O(log k) per candidate instead.
+    return "occupancy" if param <= 8 else "sorted"
+
+
+def select(stage: str, n: int, param: int, name: str = AUTO) -> Callable:
+    """
+    Pick an implementation of `stage` for a signal of length `n`.
+
+    `param` is the stage's size parameter (smoothing window or minimum peak
+    distance). An explicit `name` wins; with "auto", a tuned choice for the
+    (log2 n, log2 param) bucket is used if present, else a size heuristic.
+    """
+    if name != AUTO:
+        return get(stage, name)
+    _ensure_loaded()
+    choice = _tuning[stage].get(_bucket(n, param)) or _heuristic(stage, n, param)
+    if choice not in _registry[stage]:
+        choice = _reference[stage]
+    return _registry[stage][choice]
+
+
+def clear_tuning() -> None:
+    for table in _tuning.values():
+        table.clear()
+
+
+def load_tuning(path: Union[str, Path]) -> None:
+    """Install tuned choices previously saved by `autotune`."""
+    with open(path) as f:
+        data = json.load(f)
+    for stage, table in data.items():
+        if stage in _tuning:
+            _tuning[stage].update(table)
+
+
+def _bench(fn: Callable, args: tuple, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def autotune(
+    sizes: Iterable[int] = (1 << 12, 1 << 16, 1 << 20),
+    windows: Iterable[int] = (3, 15, 63, 255),
+    min_distances: Iterable[int] = (1, 8, 64, 512),
+    repeat: int = 3,
+    save_path: Optional[Union[str, Path]] = None,
+    seed: int = 0,
+) -> Dict[str, Dict[str, str]]:
+    """
+    Benchmark every backend on this machine and install the fastest per bucket.
+
+    Signals are random walks of each length in `sizes`; each is timed with
+    every smoothing window and minimum peak distance given. The winners are
+    installed for `select` and, if `save_path` is given, written as JSON for
+    `load_tuning`.
+
+    Returns
+    -------
+    choices : dict
+        stage -> "size_bucket:param_bucket" -> backend name.
+    """
+    _ensure_loaded()
+    rng = np.random.default_rng(seed)
+    choices: Dict[str, Dict[str, str]] = {stage: {} for stage in STAGES}
+
+    for n in sizes:
+        x = np.cumsum(rng.standard_normal(n))
+        for window in windows:
+            window = window if window % 2 else window + 1
+            timings = {
+                name: _bench(fn, (x, window, True), repeat)
+                for name, fn in _registry["smoothing"].items()
+            }
+            choices["smoothing"][_bucket(n, window)] = min(timings, key=timings.get)
+
+        smoothed = _registry["smoothing"][_reference["smoothing"]](x, 5, True)
+        for distance in min_distances:
+            timings = {
+                name: _bench(fn, (smoothed, distance, 0.0), repeat)
+                for name, fn in _registry["peaks"].items()
+            }
+            choices["peaks"][_bucket(n, distance)] = min(timings, key=timings.get)
+
+    for stage, table in choices.items():
+        _tuning[stage].update(table)
+
+    if save_path is not None:
+        path = Path(save_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(choices, f, indent=2, sort_keys=True)
+
+    return choices
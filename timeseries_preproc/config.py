@@ -9,6 +9,7 @@ class PreprocessingConfig:
     # Smoothing
     smoothing_window: int = 7  # odd integer >= 1
     smoothing_center: bool = True  # center the moving window
+    smoothing_backend: str = "auto"  # see timeseries_preproc.backends
 
     # Arc normalization
     arc_normalization: bool = True
@@ -17,6 +18,11 @@ class PreprocessingConfig:
     min_peak_distance: int = 1  # minimum index distance between peaks
     # Optionally ignore tiny peaks relative to the curve's amplitude
     min_rel_height: float = 0.0  # e.g. 0.05 => ignore peaks smaller than 5% of range
+    peaks_backend: str = "auto"  # see timeseries_preproc.backends
 
     # CSV / IO
     time_index_column: str | None = None  # if there is a time column to drop
+
+    # Preview mode: run on a decimated copy for a fast, approximate result
+    preview_factor: int = 1  # keep 1 of every N rows; 1 disables preview
+    preview_method: str = "mean"  # "mean" (block means) or "stride"
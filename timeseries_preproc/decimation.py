@@ -0,0 +1,92 @@
+from __future__ import annotations
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from .config import PreprocessingConfig
+
+PREVIEW_METHODS = ("mean", "stride")
+
+
+def decimate_dataframe(df: pd.DataFrame, factor: int, method: str = "mean") -> pd.DataFrame:
+    """
+    Reduce the number of rows by `factor`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Columns are time series curves.
+    factor : int
+        Decimation factor, >= 1.
+    method : {"mean", "stride"}
+        "mean" averages consecutive blocks of `factor` rows (NaNs skipped),
+        "stride" keeps every `factor`-th row.
+
+    Returns
+    -------
+    decimated : pandas.DataFrame
+        One row per block, labelled with the index of the row it stands for
+        (see `preview_row_offset`): the block's centre row for means, the
+        sampled row for strides. A trailing partial block whose centre lies
+        past the end is labelled with the last row.
+    """
+    if factor < 1:
+        raise ValueError("factor must be >= 1.")
+    if method not in PREVIEW_METHODS:
+        raise ValueError(f"Unknown preview method: {method!r}")
+    if factor == 1:
+        return df
+
+    if method == "stride":
+        return df.iloc[::factor]
+
+    blocks = np.arange(len(df)) // factor
+    means = df.groupby(blocks, sort=False).mean()
+    centres = np.arange(0, len(df), factor) + preview_row_offset(factor, method)
+    means.index = df.index[np.minimum(centres, len(df) - 1)]
+    return means
+
+
+def preview_config(config: PreprocessingConfig) -> PreprocessingConfig:
+    """
+    Scale window-like parameters from original samples to decimated samples.
+    """
+    factor = config.preview_factor
+    window = max(1, config.smoothing_window // factor)
+    if config.smoothing_center and window % 2 == 0:
+        window += 1
+    return replace(
+        config,
+        smoothing_window=window,
+        min_peak_distance=max(1, config.min_peak_distance // factor),
+    )
+
+
+def preview_row_offset(factor: int, method: str = "mean") -> int:
+    """
+    Original row position represented by decimated row 0.
+
+    Decimated row r stands for original row ``r * factor + offset``: the
+    block centre for block means, the sampled row for strides.
+    """
+    return factor // 2 if method == "mean" else 0
+
+
+def rescale_annotations(
+    annotations: pd.DataFrame,
+    factor: int,
+    method: str = "mean",
+) -> pd.DataFrame:
+    """
+    Map peak indices from decimated positions back to original positions.
+
+    Block means are placed at the block centre, strided samples at the
+    sample they were taken from (see `preview_row_offset`).
+    """
+    if factor == 1 or annotations.empty:
+        return annotations
+    offset = preview_row_offset(factor, method)
+    annotations = annotations.copy()
+    annotations["peak_index"] = annotations["peak_index"] * factor + offset
+    return annotations
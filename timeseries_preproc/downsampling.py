@@ -0,0 +1,150 @@
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+
+
+def _pad_rows(a: np.ndarray, multiple: int) -> np.ndarray:
+    """
+    Pad a 2D array along axis 0 to a multiple of `multiple` by repeating
+    the last row, so trailing partial buckets keep a valid envelope.
+    """
+    rem = a.shape[0] % multiple
+    if rem == 0:
+        return a
+    fill = np.repeat(a[-1:], multiple - rem, axis=0)
+    return np.concatenate([a, fill], axis=0)
+
+
+def minmax_envelope(values: np.ndarray, bucket: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min/max envelope of each column over consecutive buckets of rows.
+
+    NaNs are ignored inside a bucket; a bucket that is entirely NaN
+    yields NaN.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array of shape (n, n_curves).
+    bucket : int
+        Number of rows per bucket, >= 1.
+
+    Returns
+    -------
+    mins, maxs : np.ndarray
+        Arrays of shape (ceil(n / bucket), n_curves).
+    """
+    if bucket < 1:
+        raise ValueError("bucket must be >= 1.")
+    values = np.asarray(values)
+    if values.shape[0] == 0:
+        empty = values[:0]
+        return empty.copy(), empty.copy()
+    padded = _pad_rows(values, bucket)
+    blocks = padded.reshape(-1, bucket, values.shape[1])
+    return np.fmin.reduce(blocks, axis=1), np.fmax.reduce(blocks, axis=1)
+
+
+class MinMaxPyramid:
+    """
+    Multi-resolution min/max envelope of a set of equally long curves.
+
+    Level 0 is the raw (n, n_curves) matrix and is not copied. Level k >= 1
+    stores the per-bucket minima and maxima for buckets of
+    ``min_bucket * 2**(k - 1)`` rows, each level built from the previous one
+    by pairwise reduction. With the default ``min_bucket=4`` the extra
+    storage is about the size of the raw matrix.
+    """
+
+    def __init__(self, values: np.ndarray, min_bucket: int = 4):
+        if min_bucket < 2:
+            raise ValueError("min_bucket must be >= 2.")
+        values = np.asarray(values)
+        if values.ndim != 2:
+            raise ValueError("values must be a 2D array (n_samples, n_curves).")
+
+        self.values = values
+        self.bucket_sizes: List[int] = [1]
+        self.mins: List[np.ndarray] = [values]
+        self.maxs: List[np.ndarray] = [values]
+
+        if values.shape[0] <= 1:
+            return
+
+        mins, maxs = minmax_envelope(values, min_bucket)
+        bucket = min_bucket
+        while True:
+            self.bucket_sizes.append(bucket)
+            self.mins.append(mins)
+            self.maxs.append(maxs)
+            if mins.shape[0] <= 1:
+                break
+            mins_p = _pad_rows(mins, 2)
+            maxs_p = _pad_rows(maxs, 2)
+            mins = np.fmin(mins_p[0::2], mins_p[1::2])
+            maxs = np.fmax(maxs_p[0::2], maxs_p[1::2])
+            bucket *= 2
+
+    @property
+    def n_samples(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(m.nbytes + x.nbytes for m, x in zip(self.mins[1:], self.maxs[1:]))
+
+    def choose_level(self, start: int, stop: int, max_points: int) -> int:
+        """
+        Coarsest-needed level such that rows [start, stop) fit in `max_points`
+        output points (two points, min and max, per bucket above level 0).
+
+        Buckets are aligned to multiples of the bucket size, so an unaligned
+        range can touch one more bucket than (stop - start) / size suggests;
+        the aligned count is the one checked against the budget.
+        """
+        if max_points < 2:
+            raise ValueError("max_points must be >= 2.")
+        if stop - start <= max_points:
+            return 0
+        max_buckets = max_points // 2
+        for level, size in enumerate(self.bucket_sizes):
+            if level > 0 and -(-stop // size) - start // size <= max_buckets:
+                return level
+        return len(self.bucket_sizes) - 1
+
+    def query(
+        self,
+        column: int,
+        start: int = 0,
+        stop: int | None = None,
+        max_points: int = 1000,
+    ) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Envelope of one curve over rows [start, stop) within a point budget.
+
+        Buckets are aligned to multiples of the bucket size, so the returned
+        range may extend slightly beyond [start, stop) at the edges.
+
+        Returns
+        -------
+        bucket_size : int
+            Rows per returned point (1 means raw samples).
+        x : np.ndarray
+            Row position of the first sample in each bucket.
+        y_min, y_max : np.ndarray
+            Per-bucket minimum and maximum (equal at level 0).
+        """
+        n = self.n_samples
+        stop = n if stop is None else min(stop, n)
+        start = max(0, start)
+        if stop <= start:
+            empty = np.empty(0, dtype=self.values.dtype)
+            return 1, np.empty(0, dtype=np.int64), empty, empty
+
+        level = self.choose_level(start, stop, max_points)
+        size = self.bucket_sizes[level]
+        lo = start // size
+        hi = -(-stop // size)
+        x = np.arange(lo, hi, dtype=np.int64) * size
+        return size, x, self.mins[level][lo:hi, column], self.maxs[level][lo:hi, column]
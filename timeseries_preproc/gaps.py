@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def missing_columns(values: np.ndarray) -> np.ndarray:
+    """
+    Which columns of `values` contain missing samples, i.e. NaN or +/-inf
+    (a single bool for 1D input).
+
+    Checks the column sums, which are non-finite if any sample is: one pass
+    without the temporary mask of ``~np.isfinite(values).all(axis=0)``, so
+    complete data pays almost nothing. A column whose finite values overflow
+    the sum is reported too, which only costs it the slower masked path.
+    """
+    with np.errstate(invalid="ignore", over="ignore"):
+        return ~np.isfinite(np.asarray(values).sum(axis=0))
@@ -3,9 +3,13 @@ from typing import Union, Optional
 import pandas as pd
 
 from .config import PreprocessingConfig
+from .decimation import decimate_dataframe
 
 PathLike = Union[str, Path]
 
+# Rows per chunk (before decimation) when reading a preview
+_PREVIEW_CHUNK_BLOCKS = 4096
+
 
 def load_timeseries_csv(
     path: PathLike,
@@ -21,6 +25,9 @@ def load_timeseries_csv(
     config : PreprocessingConfig, optional
         If provided and config.time_index_column is not None, that column
         will be removed and the rest treated as time series.
+        If config.preview_factor > 1 the file is read in chunks and each
+        chunk is decimated as it is read, so the full-resolution data is
+        never held in memory.
 
     Returns
     -------
@@ -28,7 +35,26 @@ def load_timeseries_csv(
         Columns are different time series curves.
         Index is the original row index in the CSV.
     """
+    if config is not None and config.preview_factor > 1:
+        factor = config.preview_factor
+        # Chunk length is a multiple of the factor so blocks never straddle chunks
+        reader = pd.read_csv(path, index_col=0, chunksize=factor * _PREVIEW_CHUNK_BLOCKS)
+        chunks = [
+            decimate_dataframe(_clean_columns(chunk, config), factor, config.preview_method)
+            for chunk in reader
+        ]
+        if not chunks:
+            return _clean_columns(pd.read_csv(path, index_col=0), config)
+        return pd.concat(chunks)
+
     df = pd.read_csv(path, index_col = 0)
+    return _clean_columns(df, config)
+
+
+def _clean_columns(
+    df: pd.DataFrame,
+    config: Optional[PreprocessingConfig],
+) -> pd.DataFrame:
     if config is not None and config.time_index_column is not None:
         if config.time_index_column in df.columns:
             df = df.drop(columns=[config.time_index_column])
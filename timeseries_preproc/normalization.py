@@ -2,30 +2,88 @@ import numpy as np
 import pandas as pd
 
 from .config import PreprocessingConfig
+from .gaps import missing_columns
 
 
-def arc_length(x: np.ndarray) -> float:
+def arc_length(x: np.ndarray, dt: float = 1.0) -> float:
     """
     Approximate arc length of a 1D curve y(t) where t is uniform.
 
-    Arc length L ≈ sum sqrt(1 + (dy/dt)^2).
+    Arc length L ≈ sum sqrt(dt^2 + dy^2), with dt the sample spacing
+    (1 for full-resolution data, the decimation factor for previews).
+
+    NaN samples are treated as gaps and bridged: consecutive valid samples
+    are joined by a straight segment spanning the gap.
     """
     x = np.asarray(x, dtype=float)
     if x.size < 2:
         return 0.0
-    dy = np.diff(x)
-    # dt = 1, so dy/dt = dy
-    seg_lengths = np.sqrt(1.0 + dy * dy)
+    valid = ~np.isnan(x)
+    if valid.all():
+        dy = np.diff(x)
+        steps = dt
+    else:
+        pos = np.flatnonzero(valid)
+        if pos.size < 2:
+            return 0.0
+        dy = np.diff(x[pos])
+        steps = np.diff(pos) * dt
+    seg_lengths = np.sqrt(steps * steps + dy * dy)
     return float(seg_lengths.sum())
 
 
-def arc_normalize_1d(x: np.ndarray, eps: float = 1e-12) -> np.ndarray:
+def _segment_lengths(dy: np.ndarray, dt: float) -> np.ndarray:
+    # sqrt(dt^2 + dy^2) in place: whole-frame temporaries are memory bound
+    np.multiply(dy, dy, out=dy)
+    dy += dt * dt
+    return np.sqrt(dy, out=dy)
+
+
+def arc_lengths(values: np.ndarray, dt: float = 1.0) -> np.ndarray:
+    """
+    Arc length of every column of a 2D array (n, n_curves), in one
+    vectorized pass.
+
+    Gaps are bridged as in `arc_length`: each valid sample is joined to the
+    last valid sample before it, found by forward-filling valid positions.
+    """
+    values = np.asarray(values, dtype=float)
+    n, n_curves = values.shape
+    lengths = np.zeros(n_curves)
+    if n < 2:
+        return lengths
+
+    has_nan = missing_columns(values)
+    if not has_nan.any():
+        return _segment_lengths(np.diff(values, axis=0), dt).sum(axis=0)
+
+    clean = np.flatnonzero(~has_nan)
+    if clean.size:
+        lengths[clean] = _segment_lengths(np.diff(values[:, clean], axis=0), dt).sum(axis=0)
+
+    gappy = np.flatnonzero(has_nan)
+    x = values[:, gappy]
+    valid = ~np.isnan(x)
+    rows = np.arange(n)[:, None]
+    last = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    # Segment ending at row i starts at the last valid row before i
+    prev = last[:-1]
+    ends = valid[1:] & (prev >= 0)
+    start = np.maximum(prev, 0)
+    steps = (rows[1:] - start) * dt
+    dy = x[1:] - np.take_along_axis(x, start, axis=0)
+    seg = np.sqrt(steps * steps + dy * dy)
+    lengths[gappy] = np.where(ends, seg, 0.0).sum(axis=0)
+    return lengths
+
+
+def arc_normalize_1d(x: np.ndarray, eps: float = 1e-12, dt: float = 1.0) -> np.ndarray:
     """
     Normalize a curve by its arc length.
 
     Output: x / L, where L is the arc length.
     """
-    L = arc_length(x)
+    L = arc_length(x, dt=dt)
     if L < eps:
         return x * 0.0
     return x / L
@@ -34,16 +92,23 @@ def arc_normalize_1d(x: np.ndarray, eps: float = 1e-12) -> np.ndarray:
 def arc_normalize_dataframe(
     df: pd.DataFrame,
     config: PreprocessingConfig,
+    dt: float = 1.0,
 ) -> pd.DataFrame:
     """
     Apply arc length normalization to each column in the DataFrame.
+
+    `dt` is the spacing between rows in original samples, so that a
+    decimated preview is normalized by (approximately) the same arc length
+    as the full-resolution curve.
     """
     if not config.arc_normalization:
         return df.copy()
 
-    norm_cols = {}
-    for col in df.columns:
-        arr = df[col].to_numpy()
-        norm_cols[col] = arc_normalize_1d(arr)
-
-    return pd.DataFrame(norm_cols, index=df.index)
+    eps = 1e-12
+    values = df.to_numpy(dtype=float)
+    lengths = arc_lengths(values, dt=dt)
+    flat = lengths < eps
+    normalized = values / np.where(flat, 1.0, lengths)
+    # Curves with (near) zero arc length collapse to zero, as in arc_normalize_1d
+    normalized[:, flat] *= 0.0
+    return pd.DataFrame(normalized, index=df.index, columns=df.columns, copy=False)
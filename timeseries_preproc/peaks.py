@@ -1,10 +1,15 @@
 from __future__ import annotations
+from bisect import bisect_left
+
 import numpy as np
 import pandas as pd
 
+from . import backends
 from .config import PreprocessingConfig
+from .gaps import missing_columns
 
 
+@backends.register("peaks", "occupancy", reference=True)
 def find_peaks_1d(
     x: np.ndarray,
     min_distance: int = 1,
@@ -17,6 +22,9 @@ def find_peaks_1d(
     - It is strictly greater than its immediate neighbors (x[i] > x[i-1] and x[i] > x[i+1]).
     - It satisfies a relative height threshold relative to the signal's range.
 
+    NaN samples are masked out: neighbours are the nearest valid samples,
+    and the range ignores NaNs. Returned indices refer to positions in x.
+
     Parameters
     ----------
     x : array-like
@@ -37,55 +45,151 @@ def find_peaks_1d(
         Heights of detected peaks.
     """
     x = np.asarray(x, dtype=float)
-    n = x.size
-    if n < 3:
-        return np.array([], dtype=int), np.array([], dtype=float)
+    candidates, values = _peak_candidates(x, min_rel_height)
+    return _thin_occupancy(x.size, candidates, values, min_distance)
+
+
+@backends.register("peaks", "sorted")
+def find_peaks_sorted(
+    x: np.ndarray,
+    min_distance: int = 1,
+    min_rel_height: float = 0.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Same peaks as `find_peaks_1d`, with the greedy distance check done on a
+    sorted list of kept positions instead of an occupancy mask.
+
+    In `find_peaks_1d` a kept peak k blocks candidate i exactly when
+    |i - k| <= 2 * min_distance, so only the nearest kept peak on each side
+    of i needs checking: O(log k) per candidate rather than O(min_distance).
+    """
+    x = np.asarray(x, dtype=float)
+    candidates, values = _peak_candidates(x, min_rel_height)
+    return _thin_sorted(x.size, candidates, values, min_distance)
+
+
+def _thin_occupancy(
+    n: int,
+    candidates: np.ndarray,
+    values: np.ndarray,
+    min_distance: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Enforce min_distance by greedy removal of lower peaks (occupancy mask)."""
+    if min_distance <= 1 or candidates.size <= 1:
+        return candidates, values
+
+    order = np.argsort(-values)  # sort by descending height
+    kept = []
+
+    occupied = np.zeros(n, dtype=bool)
+    for idx in order:
+        i = candidates[idx]
+        if not occupied[max(0, i - min_distance): min(n, i + min_distance + 1)].any():
+            kept.append(idx)
+            occupied[max(0, i - min_distance): min(n, i + min_distance + 1)] = True
+
+    return _sorted_by_index(candidates, values, np.array(kept, dtype=int))
+
+
+def _thin_sorted(
+    n: int,
+    candidates: np.ndarray,
+    values: np.ndarray,
+    min_distance: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Same greedy removal as `_thin_occupancy`, on sorted kept positions."""
+    if min_distance <= 1 or candidates.size <= 1:
+        return candidates, values
+
+    reach = 2 * min_distance
+    order = np.argsort(-values)  # sort by descending height
+    kept = []
+    kept_positions: list[int] = []
+
+    for idx in order:
+        i = int(candidates[idx])
+        j = bisect_left(kept_positions, i)
+        if j > 0 and i - kept_positions[j - 1] <= reach:
+            continue
+        if j < len(kept_positions) and kept_positions[j] - i <= reach:
+            continue
+        kept.append(idx)
+        kept_positions.insert(j, i)
 
-    # Basic local maxima
-    candidates = []
-    for i in range(1, n - 1):
-        if x[i] > x[i - 1] and x[i] > x[i + 1]:
-            candidates.append(i)
+    return _sorted_by_index(candidates, values, np.array(kept, dtype=int))
 
-    if not candidates:
-        return np.array([], dtype=int), np.array([], dtype=float)
 
-    candidates = np.array(candidates, dtype=int)
-    values = x[candidates]
+# Distance step of each built-in backend, so whole frames can share one
+# vectorized candidate pass (see annotate_peaks_dataframe)
+_THINNING = {find_peaks_1d: _thin_occupancy, find_peaks_sorted: _thin_sorted}
+
+
+def _peak_candidates(x: np.ndarray, min_rel_height: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Local maxima of x (ignoring NaNs) that pass the relative height filter.
+    """
+    _, candidates, values = _peak_candidates_2d(x[:, None], min_rel_height)
+    return candidates, values
+
+
+def _peak_candidates_2d(
+    x: np.ndarray,
+    min_rel_height: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Local maxima of every column of x (n, n_curves) that pass the relative
+    height filter, found in one pass over the whole array.
+
+    In columns with NaNs each sample is compared with the nearest valid
+    sample on either side (forward/backward fill of valid positions).
+
+    Returns (columns, indices, values), ordered by column then index.
+    """
+    n, n_curves = x.shape
+    if n < 3:
+        empty = np.array([], dtype=int)
+        return empty, empty, np.array([], dtype=float)
+
+    is_peak = np.zeros(x.shape, dtype=bool)
+    if not missing_columns(x).any():
+        mid = x[1:-1]
+        is_peak[1:-1] = (mid > x[:-2]) & (mid > x[2:])
+    else:
+        valid = ~np.isnan(x)
+        rows = np.arange(n)[:, None]
+        # Nearest valid position strictly before / after each row
+        last = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+        first = np.minimum.accumulate(np.where(valid, rows, n)[::-1], axis=0)[::-1]
+        prev_pos = np.concatenate([np.full((1, n_curves), -1), last[:-1]])
+        next_pos = np.concatenate([first[1:], np.full((1, n_curves), n)])
+        prev_val = np.take_along_axis(x, np.maximum(prev_pos, 0), axis=0)
+        next_val = np.take_along_axis(x, np.minimum(next_pos, n - 1), axis=0)
+        is_peak = valid & (prev_pos >= 0) & (next_pos < n)
+        is_peak &= (x > prev_val) & (x > next_val)
 
     # Relative height filter
     if min_rel_height > 0.0:
-        x_min = x.min()
-        x_max = x.max()
+        x_min = np.fmin.reduce(x, axis=0)
+        x_max = np.fmax.reduce(x, axis=0)
         amplitude = x_max - x_min
-        if amplitude > 0:
-            min_abs_height = x_min + min_rel_height * amplitude
-            mask = values >= min_abs_height
-            candidates = candidates[mask]
-            values = values[mask]
-
-    # Enforce min_distance by greedy removal of lower peaks
-    if min_distance > 1 and candidates.size > 1:
-        order = np.argsort(-values)  # sort by descending height
-        kept = []
-
-        occupied = np.zeros_like(x, dtype=bool)
-        for idx in order:
-            i = candidates[idx]
-            if not occupied[max(0, i - min_distance): min(n, i + min_distance + 1)].any():
-                kept.append(idx)
-                occupied[max(0, i - min_distance): min(n, i + min_distance + 1)] = True
-
-        kept = np.array(kept, dtype=int)
-        candidates = candidates[kept]
-        values = values[kept]
-
-        # Sort peaks by index
-        sort_idx = np.argsort(candidates)
-        candidates = candidates[sort_idx]
-        values = values[sort_idx]
+        min_abs_height = np.where(amplitude > 0, x_min + min_rel_height * amplitude, -np.inf)
+        is_peak &= x >= min_abs_height
 
-    return candidates, values
+    indices, columns = np.nonzero(is_peak.T)[::-1]
+    return columns, indices, x[indices, columns]
+
+
+def _sorted_by_index(
+    candidates: np.ndarray,
+    values: np.ndarray,
+    kept: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    candidates = candidates[kept]
+    values = values[kept]
+
+    # Sort peaks by index
+    sort_idx = np.argsort(candidates)
+    return candidates[sort_idx], values[sort_idx]
 
 
 def annotate_peaks_dataframe(
@@ -94,7 +198,9 @@ def annotate_peaks_dataframe(
 ) -> pd.DataFrame:
     """
     Detect peaks for each column and keep only those with height > mean peak height
-    within that same curve.
+    within that same curve. The peak finder is the backend named by
+    config.peaks_backend ("auto" picks one from the data length and
+    min_peak_distance).
 
     Returns a tidy annotations DataFrame with columns:
         - curve_id (column name)
@@ -102,34 +208,62 @@ def annotate_peaks_dataframe(
         - peak_value (smoothed, normalized value at the peak)
         - is_salient (bool, height > mean height of all peaks for that curve)
     """
-    rows = []
-
-    for col in df.columns:
-        y = df[col].to_numpy()
-        peak_idx, peak_vals = find_peaks_1d(
-            y,
-            min_distance=config.min_peak_distance,
-            min_rel_height=config.min_rel_height,
+    find_peaks = backends.select(
+        "peaks", len(df), config.min_peak_distance, name=config.peaks_backend
+    )
+
+    values = df.to_numpy(dtype=float)
+    thin = _THINNING.get(find_peaks)
+    if thin is not None:
+        # Candidates for all curves at once; the greedy distance step is
+        # sequential, so it still runs per curve
+        cand_cols, cand_idx, cand_vals = _peak_candidates_2d(values, config.min_rel_height)
+        bounds = np.searchsorted(cand_cols, np.arange(values.shape[1] + 1))
+        per_curve = (
+            thin(
+                values.shape[0],
+                cand_idx[lo:hi],
+                cand_vals[lo:hi],
+                config.min_peak_distance,
+            )
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        )
+    else:
+        per_curve = (
+            find_peaks(
+                values[:, pos],
+                min_distance=config.min_peak_distance,
+                min_rel_height=config.min_rel_height,
+            )
+            for pos in range(values.shape[1])
         )
 
+    curve_ids = []
+    indices = []
+    peak_values = []
+    salient = []
+
+    for col, (peak_idx, peak_vals) in zip(df.columns, per_curve):
         if peak_idx.size == 0:
             continue
 
         mean_height = float(peak_vals.mean())
-        for i, v in zip(peak_idx, peak_vals):
-            rows.append(
-                {
-                    "curve_id": col,
-                    "peak_index": int(i),
-                    "peak_value": float(v),
-                    "is_salient": bool(v > mean_height),
-                }
-            )
+        curve_ids.extend([col] * peak_idx.size)
+        indices.append(peak_idx)
+        peak_values.append(peak_vals)
+        salient.append(peak_vals > mean_height)
 
-    if not rows:
+    if not indices:
         return pd.DataFrame(
             columns=["curve_id", "peak_index", "peak_value", "is_salient"]
         )
 
-    annotations = pd.DataFrame(rows)
+    annotations = pd.DataFrame(
+        {
+            "curve_id": curve_ids,
+            "peak_index": np.concatenate(indices).astype(int),
+            "peak_value": np.concatenate(peak_values).astype(float),
+            "is_salient": np.concatenate(salient),
+        }
+    )
     return annotations
@@ -1,12 +1,20 @@
 from __future__ import annotations
 from typing import Tuple
+import numpy as np
 import pandas as pd
 
 from .config import PreprocessingConfig
+from .gaps import missing_columns
 from .io import load_timeseries_csv
 from .smoothing import smooth_dataframe
 from .normalization import arc_normalize_dataframe
 from .peaks import annotate_peaks_dataframe
+from .decimation import (
+    decimate_dataframe,
+    preview_config,
+    preview_row_offset,
+    rescale_annotations,
+)
 
 
 def preprocess_dataframe(
@@ -21,6 +29,18 @@ def preprocess_dataframe(
       2. Arc normalization (optional)
       3. Peak detection + salient peak annotation
 
+    Smoothing fills short gaps (NaN or +/-inf samples) in the preprocessed
+    output, but peak detection still treats the input's missing samples as
+    masked, so no peak is ever reported at a missing row.
+
+    If config.preview_factor > 1 the input is first decimated and the steps
+    run at reduced resolution with smoothing_window and min_peak_distance
+    scaled down to match. The outputs are then approximate: both carry
+    ``attrs["approximate"] = True``, ``attrs["preview_factor"]`` and
+    ``attrs["row_offset"]``. The preprocessed rows are the decimated ones;
+    row r stands for original row ``r * preview_factor + row_offset``, and
+    peak_index is already mapped back to original row positions.
+
     Parameters
     ----------
     df : pandas.DataFrame
@@ -42,10 +62,51 @@ def preprocess_dataframe(
     if config is None:
         config = PreprocessingConfig()
 
-    smoothed = smooth_dataframe(df, config)
-    normalized = arc_normalize_dataframe(smoothed, config)
-    annotations = annotate_peaks_dataframe(normalized, config)
+    if config.preview_factor > 1:
+        df = decimate_dataframe(df, config.preview_factor, config.preview_method)
+    return _run_pipeline(df, config)
+
+
+def _mask_missing(normalized: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    `normalized` with NaN wherever the input `df` had a missing sample.
+
+    Smoothing fills short gaps, so without this the peak finder would see
+    interpolated values at missing rows and could report peaks there.
+    """
+    values = df.to_numpy(dtype=float)
+    if not missing_columns(values).any():
+        return normalized
+    return normalized.where(np.isfinite(values))
+
+
+def _run_pipeline(
+    df: pd.DataFrame,
+    config: PreprocessingConfig,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run the pipeline steps on `df`, which is already decimated when
+    config.preview_factor > 1.
+    """
+    factor = config.preview_factor
+    if factor < 1:
+        raise ValueError("preview_factor must be >= 1.")
+    if factor == 1:
+        smoothed = smooth_dataframe(df, config)
+        normalized = arc_normalize_dataframe(smoothed, config)
+        annotations = annotate_peaks_dataframe(_mask_missing(normalized, df), config)
+        return normalized, annotations
+
+    scaled = preview_config(config)
+    smoothed = smooth_dataframe(df, scaled)
+    normalized = arc_normalize_dataframe(smoothed, scaled, dt=float(factor))
+    annotations = annotate_peaks_dataframe(_mask_missing(normalized, df), scaled)
+    annotations = rescale_annotations(annotations, factor, config.preview_method)
 
+    for out in (normalized, annotations):
+        out.attrs["approximate"] = True
+        out.attrs["preview_factor"] = factor
+        out.attrs["row_offset"] = preview_row_offset(factor, config.preview_method)
     return normalized, annotations
 
 
@@ -56,6 +117,8 @@ def preprocess_csv(
     min_peak_distance: int = 1,
     min_rel_height: float = 0.0,
     time_index_column: str | None = None,
+    preview_factor: int = 1,
+    preview_method: str = "mean",
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Convenience wrapper to run the pipeline starting from a CSV path.
@@ -74,6 +137,11 @@ def preprocess_csv(
         Relative minimum height threshold for peak detection.
     time_index_column : str or None
         If not None, this column will be removed after reading the CSV.
+    preview_factor : int
+        If > 1, decimate by this factor while reading and return a fast,
+        approximate result (see `preprocess_dataframe`).
+    preview_method : {"mean", "stride"}
+        Decimation method used when preview_factor > 1.
 
     Returns
     -------
@@ -88,7 +156,10 @@ def preprocess_csv(
         min_peak_distance=min_peak_distance,
         min_rel_height=min_rel_height,
         time_index_column=time_index_column,
+        preview_factor=preview_factor,
+        preview_method=preview_method,
     )
 
+    # The loader already decimates in preview mode
     df = load_timeseries_csv(path, config=config)
-    return preprocess_dataframe(df, config=config)
+    return _run_pipeline(df, config)
@@ -1,14 +1,20 @@
 import numpy as np
 import pandas as pd
 
+from . import backends
 from .config import PreprocessingConfig
+from .gaps import missing_columns
 
 
+@backends.register("smoothing", "convolve", reference=True)
 def moving_average_1d(x: np.ndarray, window: int, center: bool = True) -> np.ndarray:
     """
     Simple moving average for a 1D array.
 
     Uses 'reflect' padding to avoid shrinking the signal at the edges.
+    NaN and +/-inf samples are treated as missing: if x contains any, the
+    masked average from `nan_moving_average` is used instead of a plain
+    convolution.
 
     Parameters
     ----------
@@ -31,6 +37,9 @@ def moving_average_1d(x: np.ndarray, window: int, center: bool = True) -> np.nda
     if window % 2 == 0 and center:
         raise ValueError("For centered smoothing, window must be odd.")
 
+    if missing_columns(x):
+        return nan_moving_average(x[:, None], window, center=center)[:, 0]
+
     pad = window - 1 if not center else window // 2
 
     # Reflect padding
@@ -43,20 +52,173 @@ def moving_average_1d(x: np.ndarray, window: int, center: bool = True) -> np.nda
     return conv
 
 
+def nan_moving_average(x: np.ndarray, window: int, center: bool = True) -> np.ndarray:
+    """
+    NaN-aware moving average applied to every column of a 2D array at once.
+
+    Missing samples (NaN or +/-inf) are masked out. Keeps running sums of
+    the valid values and of the number of valid samples (see
+    `_masked_window_sums`); each output is sum / count over its window, so
+    missing samples are skipped instead of spreading NaN (or, through the
+    running sum, inf - inf) over the rest of the curve. An output is NaN
+    only if its window holds no valid sample.
+    Padding and alignment are the same as in `moving_average_1d`.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input signals, shape (n, n_curves).
+    window : int
+        Window size, must be >= 1.
+    center : bool
+        If True, window is centered around each element.
+
+    Returns
+    -------
+    smoothed : np.ndarray
+        Smoothed signals, shape (n, n_curves) for centered windows.
+    """
+    x = np.asarray(x, dtype=float)
+    if window <= 1:
+        return x.copy()
+    if window % 2 == 0 and center:
+        raise ValueError("For centered smoothing, window must be odd.")
+
+    pad = window - 1 if not center else window // 2
+    x_padded = np.pad(x, pad_width=((pad, pad), (0, 0)), mode="reflect")
+
+    window_sums, window_counts = _masked_window_sums(x_padded, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+
+def _masked_window_sums(x: np.ndarray, window: int) -> tuple:
+    """
+    Sums and counts of the finite samples in every length-`window` run of
+    rows of x (m, n_curves); m - window + 1 rows each.
+
+    A single running sum over the whole column loses precision as it grows
+    (large offsets, trends), and window sums taken as its differences drift.
+    Instead rows are cut into blocks of `window` rows and running sums of
+    deviations from an anchor restart in every block. Every window covers
+    the tail of one block and the head of the next, so its sum is built
+    from two block-local prefix sums plus anchor * count, and rounding error
+    is bounded by the window, not the column length. Complete columns anchor
+    each block at its first sample; columns with missing samples anchor at
+    the column mean, which only needs the window counts.
+    """
+    m, n_curves = x.shape
+    n_out = m - window + 1
+    n_blocks = m // window + 1  # room for the end position of the last window
+    rows = n_blocks * window
+
+    values = np.zeros((rows, n_curves))
+    if not missing_columns(x).any():
+        values[:m] = x
+        values_b = values.reshape(n_blocks, window, n_curves)
+        anchors = values_b[:, :1].copy()
+        deviations = values_b - anchors
+        deviations[-1, m - (n_blocks - 1) * window :] = 0.0
+
+        # A window starting at row r of its block takes window - r rows from
+        # that block and r rows from the next
+        head = np.arange(window, dtype=float)[None, :, None]
+        sums = _across_blocks(deviations)
+        sums += anchors[:-1] * (window - head)
+        sums += anchors[1:] * head
+        sums = sums.reshape(-1, n_curves)[:n_out]
+        return sums, np.full_like(sums, float(window))
+
+    # Counts are integers, so a single running count is exact
+    valid = np.isfinite(x)
+    counts_before = np.zeros((m + 1, n_curves), dtype=np.int64)
+    np.cumsum(valid, axis=0, out=counts_before[1:])
+    counts = counts_before[window:] - counts_before[:-window]
+
+    anchors = np.sum(x, axis=0, where=valid) / np.maximum(counts_before[-1], 1)
+    np.subtract(x, anchors, out=values[:m], where=valid)
+    sums = _across_blocks(values.reshape(n_blocks, window, n_curves))
+    sums = sums.reshape(-1, n_curves)[:n_out]
+    sums += anchors * counts
+    return sums, counts
+
+
+def _across_blocks(blocks: np.ndarray) -> np.ndarray:
+    # Sum over the tail of block b from row r plus the head of block b + 1
+    # up to row r, for blocks (n_blocks, window, n_curves)
+    prefix = np.cumsum(blocks, axis=1)
+    totals = prefix[:-1, -1:].copy()
+    prefix -= blocks
+    out = prefix[1:] - prefix[:-1]
+    out += totals
+    return out
+
+
+@backends.register("smoothing", "cumsum")
+def moving_average_cumsum(x: np.ndarray, window: int, center: bool = True) -> np.ndarray:
+    """
+    Moving average from a running sum, O(n) regardless of window size.
+
+    Same padding, alignment and NaN handling as `moving_average_1d`.
+    """
+    x = np.asarray(x, dtype=float)
+    return nan_moving_average(x[:, None], window, center=center)[:, 0]
+
+
+@backends.register("smoothing", "fft")
+def moving_average_fft(x: np.ndarray, window: int, center: bool = True) -> np.ndarray:
+    """
+    Moving average computed as an FFT convolution, O(n log n).
+
+    Same padding and alignment as `moving_average_1d`; inputs with missing
+    samples use the masked running-sum path.
+    """
+    x = np.asarray(x, dtype=float)
+    if window <= 1 or missing_columns(x):
+        return moving_average_1d(x, window, center=center)
+    if window % 2 == 0 and center:
+        raise ValueError("For centered smoothing, window must be odd.")
+
+    pad = window - 1 if not center else window // 2
+    x_padded = np.pad(x, pad_width=pad, mode="reflect")
+    size = x_padded.size + window - 1
+    nfft = 1 << (size - 1).bit_length()
+    kernel = np.full(window, 1.0 / window)
+    full = np.fft.irfft(np.fft.rfft(x_padded, nfft) * np.fft.rfft(kernel, nfft), nfft)
+    # Keep the 'valid' part of the full linear convolution
+    return full[window - 1 : x_padded.size]
+
+
 def smooth_dataframe(
     df: pd.DataFrame,
     config: PreprocessingConfig,
 ) -> pd.DataFrame:
     """
     Apply moving average smoothing to each column in the DataFrame.
+
+    Columns without missing samples use the smoothing backend named by
+    config.smoothing_backend ("auto" picks one from the data length and
+    window); all columns with NaN or +/-inf samples are smoothed together
+    by `nan_moving_average`.
     """
     win = config.smoothing_window
     center = config.smoothing_center
+    smooth_1d = backends.select(
+        "smoothing", len(df), win, name=config.smoothing_backend
+    )
+
+    values = df.to_numpy(dtype=float)
+    has_nan = missing_columns(values)
+    gappy = np.flatnonzero(has_nan)
+    if gappy.size and win > 1:
+        gappy_smoothed = nan_moving_average(values[:, gappy], window=win, center=center)
 
     smoothed_columns = {}
-    for col in df.columns:
-        series = df[col].to_numpy()
-        smoothed = moving_average_1d(series, window=win, center=center)
-        smoothed_columns[col] = smoothed
+    gappy_pos = {pos: k for k, pos in enumerate(gappy)}
+    for pos, col in enumerate(df.columns):
+        if has_nan[pos] and win > 1:
+            smoothed_columns[col] = gappy_smoothed[:, gappy_pos[pos]]
+        else:
+            smoothed_columns[col] = smooth_1d(values[:, pos], win, center)
 
     return pd.DataFrame(smoothed_columns, index=df.index)